@@ -0,0 +1,7 @@
+"""Run the deploy CLI: python3 -m deployment <command>"""
+
+import sys
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
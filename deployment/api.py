@@ -1,56 +1,304 @@
 """App Store Connect API Client"""
 
-import jwt
 import time
+import threading
 import requests
-from typing import Optional, Dict, Any
-from .config import KEY_ID, ISSUER_ID, KEY_FILE, BASE_URL
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit, urlencode
+from typing import Optional, Dict, Any, Iterator, Union, Iterable, List
+from .auth import TokenManager, StaticToken, get_token_manager
+from .cassette import Cassette
+from .cache import ResponseCache
+from .metrics import RequestMetrics
+from .ratelimit import (
+    RateLimiter, get_rate_limiter, should_retry, backoff_delay, parse_retry_after, MAX_RETRIES
+)
+from .config import BASE_URL, POOL_SIZE
+
+# Largest page App Store Connect returns for list endpoints
+MAX_PAGE_SIZE = 200
+
+
+class APIError(Exception):
+    """A list page could not be fetched, so a collection cannot be read in full"""
+
+    def __init__(self, url: str, status: Optional[int], error: str):
+        super().__init__(f"GET {url} failed ({status}): {error}")
+        self.url = url
+        self.status = status
+        self.error = error
 
 
 class AppStoreAPI:
     """Wrapper for App Store Connect API with JWT authentication"""
 
-    def __init__(self):
-        self.token = self._generate_jwt()
-        self.headers = {
+    def __init__(self, pool_size: int = POOL_SIZE, token_manager: Optional[TokenManager] = None,
+                 scoped: bool = False, rate_limiter: Optional[RateLimiter] = None,
+                 max_retries: int = MAX_RETRIES, cache: Optional[ResponseCache] = None,
+                 cassette: Optional[Cassette] = None, base_url: str = BASE_URL):
+        if token_manager is None and cassette is not None and cassette.mode == "replay":
+            # Replays never reach Apple, so no key is needed
+            token_manager = StaticToken("replay")
+        self.tokens = token_manager or get_token_manager()
+        self.cassette = cassette
+        self.base_url = base_url
+        self.scoped = scoped
+        self.limiter = rate_limiter or get_rate_limiter()
+        self.max_retries = max_retries
+        self.cache = cache
+        self.metrics = RequestMetrics()
+        self.pool_size = pool_size
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+
+    @property
+    def token(self) -> str:
+        """Current (unscoped) JWT, re-signed automatically before it expires"""
+        return self.tokens.token()
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Request headers carrying a fresh token"""
+        return {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         }
 
-    def _generate_jwt(self) -> str:
-        """Generate JWT token for API authentication"""
-        with open(KEY_FILE, 'r') as f:
-            private_key = f.read()
-
-        token = jwt.encode(
-            {
-                "iss": ISSUER_ID,
-                "exp": int(time.time()) + 1200,  # 20 minutes
-                "aud": "appstoreconnect-v1"
-            },
-            private_key,
-            algorithm="ES256",
-            headers={"kid": KEY_ID, "typ": "JWT"}
+    def _scope(self, method: str, url: str) -> Optional[List[str]]:
+        """Token scope for one request, or None when tokens are not scoped"""
+        if not self.scoped:
+            return None
+
+        parts = urlsplit(url)
+        return [f"{method} {parts.path}" + (f"?{parts.query}" if parts.query else "")]
+
+    def _headers_for(self, method: str, url: str) -> Dict[str, str]:
+        """Headers for one request, with a per-endpoint scoped token if enabled"""
+        scope = self._scope(method, url)
+        if scope is None:
+            return self.headers
+
+        return {
+            "Authorization": f"Bearer {self.tokens.token(scope)}",
+            "Content-Type": "application/json"
+        }
+
+    def session_for(self, url: str) -> requests.Session:
+        """Return the pooled keep-alive session for the URL's host"""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                if self.cassette is not None:
+                    adapter = self.cassette.adapter(adapter)
+                session.mount(f"{parts.scheme}://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def _request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                 extra_headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        """
+        Send a request with pacing and retries
+
+        API calls (headers=None) are authenticated and paced by the shared rate
+        limiter. Retryable failures are retried with jittered exponential
+        backoff, honoring Retry-After. Cassette replays skip pacing and backoff.
+        """
+        session = self.session_for(url)
+        api_call = headers is None
+        # Replayed responses come from disk: pacing and backoff would only slow them down
+        replaying = self.cassette is not None and self.cassette.mode == "replay"
+        paced = api_call and not replaying
+        refreshed = False
+        attempt = 0
+        response = None
+        start = time.perf_counter()
+
+        try:
+            while True:
+                if paced:
+                    self.limiter.acquire()
+
+                # Streamed bodies are sent from the start again on every attempt
+                if hasattr(kwargs.get("data"), "seek"):
+                    kwargs["data"].seek(0)
+
+                try:
+                    request_headers = {**self._headers_for(method, url), **(extra_headers or {})} if api_call else headers
+                    response = session.request(method, url, headers=request_headers, **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    if attempt >= self.max_retries or not should_retry(method, None):
+                        raise
+                    if not replaying:
+                        time.sleep(backoff_delay(attempt))
+                    attempt += 1
+                    continue
+
+                if paced:
+                    self.limiter.update(response.headers)
+
+                if api_call:
+                    if response.status_code == 401 and not refreshed:
+                        # Token rejected (expired or revoked): re-sign once and retry
+                        self.tokens.invalidate(self._scope(method, url))
+                        refreshed = True
+                        continue
+
+                if attempt >= self.max_retries or not should_retry(method, response.status_code):
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429 and paced:
+                    # Hold every worker sharing the limiter, not just this one
+                    self.limiter.pause(retry_after or backoff_delay(attempt))
+                if not replaying:
+                    time.sleep(backoff_delay(attempt, retry_after))
+                attempt += 1
+        finally:
+            self._record(method, url, response, time.perf_counter() - start, attempt, api_call)
+
+    def _record(self, method: str, url: str, response: Optional[requests.Response], latency: float,
+                retries: int, api_call: bool):
+        """Add one finished request to the client's metrics"""
+        if response is None:
+            self.metrics.record(method, url, None, latency, retries=retries)
+            return
+
+        self.metrics.record(
+            method, url, response.status_code, latency,
+            bytes_sent=int(response.request.headers.get("Content-Length", 0)),
+            bytes_received=len(response.content),
+            retries=retries,
+            rate_limit_remaining=self.limiter.remaining if api_call else None
         )
-        return token
 
-    def get(self, endpoint: str) -> Dict[Any, Any]:
-        """GET request"""
-        url = f"{BASE_URL}/{endpoint}"
-        response = requests.get(url, headers=self.headers)
+    def _url(self, endpoint: str) -> str:
+        """Absolute URL for an endpoint (pagination links already are)"""
+        return endpoint if "://" in endpoint else f"{self.base_url}/{endpoint}"
 
-        if response.status_code == 200:
-            return response.json()
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send an API request over the pooled session"""
+        url = self._url(endpoint)
+        response = self._request(method, url, **kwargs)
+
+        if self.cache is not None and method != "GET":
+            # Cached reads of the mutated resource type are now stale
+            self.cache.invalidate(url)
+
+        return response
+
+    def upload_part(self, url: str, data, headers: Dict[str, str]) -> requests.Response:
+        """PUT an asset part to an upload operation URL (retried on failure)"""
+        return self._request("PUT", url, headers=headers, data=data)
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-host request and connection counts (reused = requests - connections)"""
+        stats = {}
+        with self._sessions_lock:
+            sessions = list(self._sessions.items())
+
+        for host, session in sessions:
+            requests_sent = 0
+            connections = 0
+            for adapter in session.adapters.values():
+                if not hasattr(adapter, "poolmanager"):
+                    continue  # Replayed responses use no connections
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    requests_sent += pool.num_requests
+                    connections += pool.num_connections
+            stats[host] = {
+                "requests": requests_sent,
+                "connections": connections,
+                "reused": max(requests_sent - connections, 0)
+            }
+        return stats
+
+    def close(self):
+        """Close all pooled sessions (and save a recording cassette)"""
+        if self.cassette is not None:
+            self.cassette.save()
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def get(self, endpoint: str, revalidate: bool = False) -> Dict[Any, Any]:
+        """
+        GET request (served from the response cache when enabled)
+
+        Args:
+            revalidate: Ask the server even if the cached copy is fresh (still
+                sent with If-None-Match), e.g. when polling for a state change
+        """
+        url = self._url(endpoint)
+        cached, etag = None, None
+        if self.cache is not None:
+            cached, etag, fresh = self.cache.lookup(url)
+            if fresh and not revalidate:
+                return cached
+
+        response = self._send("GET", url, extra_headers={"If-None-Match": etag} if etag else None)
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.refresh(url)
+            return cached
+        elif response.status_code == 200:
+            body = response.json()
+            if self.cache is not None:
+                self.cache.store(url, body, response.headers.get("ETag"))
+            return body
         else:
             return {
                 "error": response.text,
                 "status": response.status_code
             }
 
+    def iter(self, endpoint: str, fields: Optional[Dict[str, Union[str, Iterable[str]]]] = None,
+             limit: Optional[int] = None) -> Iterator[Dict[Any, Any]]:
+        """
+        Stream resources from a list endpoint, following links.next lazily
+
+        Args:
+            endpoint: List endpoint, may already carry filter/sort parameters
+            fields: Sparse fieldsets, e.g. {"apps": "bundleId"} -> fields[apps]=bundleId
+            limit: Stop after this many resources (None streams everything)
+
+        Raises:
+            APIError: A page request failed (so it is not mistaken for an empty list)
+        """
+        params = {"limit": min(limit, MAX_PAGE_SIZE) if limit else MAX_PAGE_SIZE}
+        for resource_type, names in (fields or {}).items():
+            params[f"fields[{resource_type}]"] = names if isinstance(names, str) else ",".join(names)
+
+        separator = "&" if "?" in endpoint else "?"
+        url = f"{endpoint}{separator}{urlencode(params, safe='[],')}"
+
+        count = 0
+        while url:
+            page = self.get(url)
+            if "data" not in page:
+                raise APIError(url, page.get("status"), page.get("error", "no data in response"))
+
+            for resource in page["data"]:
+                yield resource
+                count += 1
+                if limit and count >= limit:
+                    return
+
+            url = page.get("links", {}).get("next")
+
     def post(self, endpoint: str, data: Dict) -> Dict[Any, Any]:
         """POST request"""
-        url = f"{BASE_URL}/{endpoint}"
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self._send("POST", endpoint, json=data)
 
         if response.status_code in [200, 201]:
             return response.json()
@@ -62,11 +310,13 @@ class AppStoreAPI:
 
     def patch(self, endpoint: str, data: Dict) -> Dict[Any, Any]:
         """PATCH request"""
-        url = f"{BASE_URL}/{endpoint}"
-        response = requests.patch(url, headers=self.headers, json=data)
+        response = self._send("PATCH", endpoint, json=data)
 
         if response.status_code == 200:
             return response.json()
+        elif response.status_code == 204:
+            # Relationship updates succeed without a body
+            return {}
         else:
             return {
                 "error": response.text,
@@ -75,8 +325,7 @@ class AppStoreAPI:
 
     def delete(self, endpoint: str) -> bool:
         """DELETE request"""
-        url = f"{BASE_URL}/{endpoint}"
-        response = requests.delete(url, headers=self.headers)
+        response = self._send("DELETE", endpoint)
 
         if response.status_code == 204:
             return True
@@ -0,0 +1,196 @@
+"""Asyncio App Store Connect API Client"""
+
+import time
+import asyncio
+from urllib.parse import urlencode
+from typing import Optional, Dict, Any, AsyncIterator, Union, Iterable
+from .auth import TokenManager, get_token_manager
+from .api import MAX_PAGE_SIZE, APIError
+from .metrics import RequestMetrics
+from .ratelimit import (
+    RateLimiter, get_rate_limiter, should_retry, backoff_delay, parse_retry_after, MAX_RETRIES
+)
+from .config import BASE_URL, POOL_SIZE
+
+try:
+    import httpx
+except ImportError:  # Optional dependency, only needed for the async client
+    httpx = None
+
+
+class AsyncAppStoreAPI:
+    """
+    Asyncio counterpart of AppStoreAPI
+
+    Requests are multiplexed over HTTP/2, so many in-flight calls share a few
+    connections. Methods mirror AppStoreAPI and return the same error dicts.
+    """
+
+    def __init__(self, max_connections: int = POOL_SIZE, token_manager: Optional[TokenManager] = None,
+                 timeout: float = 60.0, rate_limiter: Optional[RateLimiter] = None,
+                 max_retries: int = MAX_RETRIES, base_url: str = BASE_URL):
+        if httpx is None:
+            raise ImportError("AsyncAppStoreAPI requires httpx with HTTP/2 support: pip install 'httpx[http2]'")
+
+        self.tokens = token_manager or get_token_manager()
+        self.limiter = rate_limiter or get_rate_limiter()
+        self.max_retries = max_retries
+        self.base_url = base_url
+        self.metrics = RequestMetrics()
+        self._client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout
+        )
+
+    async def __aenter__(self) -> "AsyncAppStoreAPI":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Request headers carrying a fresh token"""
+        return {
+            "Authorization": f"Bearer {self.tokens.token()}",
+            "Content-Type": "application/json"
+        }
+
+    async def _request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                       **kwargs) -> "httpx.Response":
+        """Send a request with pacing and retries (see AppStoreAPI._request)"""
+        api_call = headers is None
+        refreshed = False
+        attempt = 0
+        response = None
+        start = time.perf_counter()
+
+        try:
+            while True:
+                if api_call:
+                    wait = self.limiter.reserve()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+
+                try:
+                    response = await self._client.request(
+                        method, url, headers=self.headers if api_call else headers, **kwargs
+                    )
+                except httpx.TransportError:
+                    if attempt >= self.max_retries or not should_retry(method, None):
+                        raise
+                    await asyncio.sleep(backoff_delay(attempt))
+                    attempt += 1
+                    continue
+
+                if api_call:
+                    self.limiter.update(response.headers)
+
+                    if response.status_code == 401 and not refreshed:
+                        # Token rejected (expired or revoked): re-sign once and retry
+                        self.tokens.invalidate()
+                        refreshed = True
+                        continue
+
+                if attempt >= self.max_retries or not should_retry(method, response.status_code):
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429 and api_call:
+                    self.limiter.pause(retry_after or backoff_delay(attempt))
+                await asyncio.sleep(backoff_delay(attempt, retry_after))
+                attempt += 1
+        finally:
+            if response is None:
+                self.metrics.record(method, url, None, time.perf_counter() - start, retries=attempt)
+            else:
+                self.metrics.record(
+                    method, url, response.status_code, time.perf_counter() - start,
+                    bytes_sent=int(response.request.headers.get("Content-Length", 0)),
+                    bytes_received=len(response.content),
+                    retries=attempt,
+                    rate_limit_remaining=self.limiter.remaining if api_call else None
+                )
+
+    async def _send(self, method: str, endpoint: str, **kwargs) -> "httpx.Response":
+        """Send an API request over the shared HTTP/2 client"""
+        url = endpoint if "://" in endpoint else f"{self.base_url}/{endpoint}"
+        return await self._request(method, url, **kwargs)
+
+    async def upload_part(self, url: str, data, headers: Dict[str, str]) -> "httpx.Response":
+        """PUT an asset part to an upload operation URL (retried on failure)"""
+        return await self._request("PUT", url, headers=headers, content=data)
+
+    async def close(self):
+        """Close the underlying connections"""
+        await self._client.aclose()
+
+    async def get(self, endpoint: str) -> Dict[Any, Any]:
+        """GET request"""
+        response = await self._send("GET", endpoint)
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            return {
+                "error": response.text,
+                "status": response.status_code
+            }
+
+    async def iter(self, endpoint: str, fields: Optional[Dict[str, Union[str, Iterable[str]]]] = None,
+                   limit: Optional[int] = None) -> AsyncIterator[Dict[Any, Any]]:
+        """Stream resources from a list endpoint (see AppStoreAPI.iter)"""
+        params = {"limit": min(limit, MAX_PAGE_SIZE) if limit else MAX_PAGE_SIZE}
+        for resource_type, names in (fields or {}).items():
+            params[f"fields[{resource_type}]"] = names if isinstance(names, str) else ",".join(names)
+
+        separator = "&" if "?" in endpoint else "?"
+        url = f"{endpoint}{separator}{urlencode(params, safe='[],')}"
+
+        count = 0
+        while url:
+            page = await self.get(url)
+            if "data" not in page:
+                raise APIError(url, page.get("status"), page.get("error", "no data in response"))
+
+            for resource in page["data"]:
+                yield resource
+                count += 1
+                if limit and count >= limit:
+                    return
+
+            url = page.get("links", {}).get("next")
+
+    async def post(self, endpoint: str, data: Dict) -> Dict[Any, Any]:
+        """POST request"""
+        response = await self._send("POST", endpoint, json=data)
+
+        if response.status_code in [200, 201]:
+            return response.json()
+        else:
+            return {
+                "error": response.text,
+                "status": response.status_code
+            }
+
+    async def patch(self, endpoint: str, data: Dict) -> Dict[Any, Any]:
+        """PATCH request"""
+        response = await self._send("PATCH", endpoint, json=data)
+
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 204:
+            # Relationship updates succeed without a body
+            return {}
+        else:
+            return {
+                "error": response.text,
+                "status": response.status_code
+            }
+
+    async def delete(self, endpoint: str) -> bool:
+        """DELETE request"""
+        response = await self._send("DELETE", endpoint)
+
+        return response.status_code == 204
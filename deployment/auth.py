@@ -0,0 +1,117 @@
+"""JWT Token Management for App Store Connect API"""
+
+import time
+import threading
+from typing import Optional, Dict, List, Tuple
+from .config import KEY_ID, ISSUER_ID, KEY_FILE
+
+# Apple rejects tokens that live longer than 20 minutes
+TOKEN_LIFETIME = 1200
+# Re-sign this many seconds before the current token expires
+REFRESH_MARGIN = 120
+
+
+class TokenManager:
+    """
+    Signs and caches App Store Connect JWTs
+
+    The private key is parsed once and each signed token is reused until it
+    gets within the refresh margin of its expiry. Safe to share between threads.
+    """
+
+    def __init__(self, key_id: str = KEY_ID, issuer_id: str = ISSUER_ID, key_file: str = KEY_FILE,
+                 lifetime: int = TOKEN_LIFETIME, margin: int = REFRESH_MARGIN):
+        self.key_id = key_id
+        self.issuer_id = issuer_id
+        self.key_file = key_file
+        self.lifetime = lifetime
+        self.margin = margin
+        self._private_key = None
+        self._tokens: Dict[Tuple[str, ...], Tuple[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _load_key(self):
+        """Parse the .p8 private key (once)"""
+        if self._private_key is None:
+            from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+            with open(self.key_file, 'rb') as f:
+                self._private_key = load_pem_private_key(f.read(), password=None)
+        return self._private_key
+
+    def token(self, scope: Optional[List[str]] = None) -> str:
+        """
+        Return a valid token, signing a new one only when needed
+
+        Args:
+            scope: Optional list of "METHOD /v1/path" entries for a scoped token
+        """
+        key = tuple(scope or ())
+
+        # Fast path without taking the lock
+        cached = self._tokens.get(key)
+        if cached and cached[1] - self.margin > time.time():
+            return cached[0]
+
+        with self._lock:
+            now = int(time.time())
+            cached = self._tokens.get(key)
+            if cached and cached[1] - self.margin > now:
+                return cached[0]
+
+            expires = now + self.lifetime
+            claims = {
+                "iss": self.issuer_id,
+                "iat": now,
+                "exp": expires,
+                "aud": "appstoreconnect-v1"
+            }
+            if scope:
+                claims["scope"] = list(scope)
+
+            import jwt  # Deferred: only needed once a request is actually signed
+
+            token = jwt.encode(
+                claims,
+                self._load_key(),
+                algorithm="ES256",
+                headers={"kid": self.key_id, "typ": "JWT"}
+            )
+
+            # Drop expired entries so scoped tokens don't pile up
+            self._tokens = {k: v for k, v in self._tokens.items() if v[1] > now}
+            self._tokens[key] = (token, expires)
+            return token
+
+    def invalidate(self, scope: Optional[List[str]] = None):
+        """Forget a cached token (e.g. after a 401) so the next call re-signs"""
+        with self._lock:
+            self._tokens.pop(tuple(scope or ()), None)
+
+
+class StaticToken:
+    """Fixed token with the TokenManager interface (offline replays, local servers)"""
+
+    def __init__(self, value: str = "offline"):
+        self.value = value
+
+    def token(self, scope: Optional[List[str]] = None) -> str:
+        return self.value
+
+    def invalidate(self, scope: Optional[List[str]] = None):
+        pass
+
+
+_managers: Dict[Tuple[str, str, str], TokenManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_token_manager(key_id: str = KEY_ID, issuer_id: str = ISSUER_ID, key_file: str = KEY_FILE) -> TokenManager:
+    """Return the process-wide TokenManager for these credentials"""
+    key = (key_id, issuer_id, key_file)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = TokenManager(key_id, issuer_id, key_file)
+            _managers[key] = manager
+        return manager
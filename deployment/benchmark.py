@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Benchmark the deployment flows against the local App Store Connect stand-in
+
+Times screenshot upload, metadata upload and the version flow at realistic
+scale and reports throughput and p50/p95 request latency. Nothing talks to Apple.
+
+Usage:
+    python3 deployment/benchmark.py [--locales 10] [--display-types 4] [--screenshots 10]
+                                    [--latency 0.02] [--error-rate 0.0] [--max-rate 20]
+                                    [--output FILE]
+    python3 deployment/benchmark.py --startup [--startup-budget 0.25]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import argparse
+import statistics
+import subprocess
+import tempfile
+import contextlib
+from pathlib import Path
+
+# Add parent directory to path so we can import deployment module
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from deployment.api import AppStoreAPI
+from deployment.auth import StaticToken
+from deployment.ratelimit import RateLimiter, MAX_RATE
+from deployment.metrics import percentile
+from deployment.mock_server import MockAppStoreServer
+from deployment.bundle import get_app_id
+from deployment.screenshots import upload_screenshots
+from deployment.metadata import upload_metadata, upload_version_metadata, METADATA_DIR
+from deployment.version import create_version, get_latest_build, attach_build_to_version, submit_for_review
+from deployment.config import BUNDLE_ID
+
+# Filename prefix and pixel size per display key
+SCREENSHOT_SPECS = [
+    ("1_iphone67", 1320, 2868),
+    ("1b_iphone65", 1242, 2688),
+    ("2_iphone61", 1179, 2556),
+    ("3_ipad", 2064, 2752),
+]
+LOCALES = ["en-US", "de-DE", "fr-FR", "es-ES", "it", "ja", "ko", "pt-BR", "zh-Hans", "nl-NL",
+           "sv", "da", "fi", "no", "pl", "ru", "tr", "ar-SA", "he", "th"]
+
+# Median cold start of `slidecast-deploy --help` must stay under this (seconds)
+STARTUP_BUDGET = 0.25
+# Modules the CLI must not import before a subcommand needs them
+HEAVY_MODULES = ("requests", "urllib3", "jwt", "cryptography", "sqlite3", "httpx")
+
+
+def make_png(path: Path, width: int, height: int, shade: int = 0):
+    """Write a valid RGB PNG of the given size (solid colour, so it stays small)"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\x00" + bytes([shade % 256, 64, 128]) * width
+    pixels = zlib.compress(row * height, 6)
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", pixels)
+        + chunk(b"IEND", b"")
+    )
+
+
+def make_screenshots(root: Path, locales, display_types: int, per_type: int):
+    """Create deployment/screenshots/<locale>/ style fixture folders"""
+    templates = {}
+    for locale in locales:
+        folder = root / locale
+        folder.mkdir(parents=True, exist_ok=True)
+        for prefix, width, height in SCREENSHOT_SPECS[:display_types]:
+            for index in range(1, per_type + 1):
+                key = (prefix, index)
+                if key not in templates:
+                    template = root / f"_{prefix}_{index:02d}.png"
+                    make_png(template, width, height, shade=index)
+                    templates[key] = template.read_bytes()
+                (folder / f"{prefix}_{index:02d}.png").write_bytes(templates[key])
+
+
+def make_metadata(root: Path, locales):
+    """Create deployment/metadata/<locale>/ style fixture folders from the en-US metadata"""
+    source = Path(ROOT) / METADATA_DIR
+    for locale in locales:
+        folder = root / locale
+        folder.mkdir(parents=True, exist_ok=True)
+        for file_path in source.glob("*.txt"):
+            (folder / file_path.name).write_text(file_path.read_text())
+
+
+def run(name: str, server: MockAppStoreServer, work, units: int, max_rate: float = MAX_RATE) -> dict:
+    """Run one scenario on a fresh client and summarise its requests"""
+    api = AppStoreAPI(token_manager=StaticToken("bench"), rate_limiter=RateLimiter(max_rate=max_rate),
+                      base_url=server.base_url)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok = work(api)
+    elapsed = time.perf_counter() - start
+
+    latencies = [record["latency"] for record in api.metrics.records]
+    api.close()
+    return {
+        "name": name,
+        "ok": bool(ok),
+        "seconds": elapsed,
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "units": units,
+        "units_per_second": units / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+    }
+
+
+def measure_startup(runs: int = 7) -> dict:
+    """Time cold `python -m deployment --help` runs and list heavy modules the CLI imports"""
+    def timed(command) -> float:
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        return time.perf_counter() - start
+
+    cli = statistics.median(timed([sys.executable, "-m", "deployment", "--help"]) for _ in range(runs))
+    # Reference: what importing one of the standalone scripts costs
+    script = statistics.median(timed([sys.executable, "-c", "import deployment.upload_metadata"]) for _ in range(runs))
+
+    probe = subprocess.run(
+        [sys.executable, "-c",
+         "import sys\n"
+         "from deployment.cli import build_parser\n"
+         "build_parser()\n"
+         f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return {
+        "cli_seconds": cli,
+        "script_import_seconds": script,
+        "heavy_modules": [m for m in probe.stdout.strip().split(",") if m]
+    }
+
+
+def check_startup(budget: float) -> int:
+    """Startup-time guard: fail if the CLI got slow or started importing heavy modules"""
+    print("=" * 60)
+    print("⏱️  CLI Startup")
+    print("=" * 60)
+
+    result = measure_startup()
+    print(f"\nslidecast-deploy --help:           {result['cli_seconds'] * 1000:7.1f} ms (budget {budget * 1000:.0f} ms)")
+    print(f"import deployment.upload_metadata: {result['script_import_seconds'] * 1000:7.1f} ms")
+
+    ok = True
+    if result["heavy_modules"]:
+        print(f"❌ CLI imported heavy modules at startup: {', '.join(result['heavy_modules'])}")
+        ok = False
+    if result["cli_seconds"] > budget:
+        print("❌ CLI startup exceeded budget")
+        ok = False
+    if ok:
+        print("✅ Startup within budget")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deployment flows against a local stand-in server")
+    parser.add_argument("--locales", type=int, default=10)
+    parser.add_argument("--display-types", type=int, default=4, choices=range(1, len(SCREENSHOT_SPECS) + 1))
+    parser.add_argument("--screenshots", type=int, default=10, help="Screenshots per display type")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 503")
+    parser.add_argument("--max-rate", type=float, default=MAX_RATE, help="Client API pacing (requests/second)")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--startup", action="store_true", help="Only run the CLI startup-time guard")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET)
+    args = parser.parse_args()
+
+    if args.startup:
+        return check_startup(args.startup_budget)
+
+    # The flows read deployment/metadata/... relative to the repo root
+    os.chdir(ROOT)
+    locales = LOCALES[:args.locales]
+
+    print("=" * 60)
+    print("⏱️  Deployment Benchmarks (local stand-in server)")
+    print("=" * 60)
+    print(f"\n{len(locales)} locales × {args.display_types} display types × {args.screenshots} screenshots, "
+          f"{args.latency * 1000:.0f}ms latency, {args.error_rate:.0%} errors")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, \
+            MockAppStoreServer(latency=args.latency, hourly_limit=10 ** 9, error_rate=args.error_rate) as server:
+        ids = server.store.seed(BUNDLE_ID, locales)
+        screenshots_root = Path(tmp) / "screenshots"
+        make_screenshots(screenshots_root, locales, args.display_types, args.screenshots)
+        metadata_root = Path(tmp) / "metadata"
+        make_metadata(metadata_root, locales)
+
+        def screenshots(api):
+            return upload_screenshots(api, ids["version_id"], str(screenshots_root))
+
+        def metadata(api):
+            app_id = get_app_id(api)
+            return (upload_metadata(api, app_id, str(metadata_root))
+                    and upload_version_metadata(api, ids["version_id"], str(metadata_root)))
+
+        def version_flow(api):
+            app_id = get_app_id(api)
+            version_id = create_version(api, app_id, "9.9")
+            build_id = get_latest_build(api, app_id)
+            return (version_id and build_id and attach_build_to_version(api, version_id, build_id)
+                    and submit_for_review(api, version_id))
+
+        total_screenshots = len(locales) * args.display_types * args.screenshots
+        results.append(run("upload_screenshots", server, screenshots, total_screenshots, args.max_rate))
+        # Second pass finds every screenshot already uploaded and skips it
+        results.append(run("upload_screenshots (unchanged)", server, screenshots, total_screenshots, args.max_rate))
+        results.append(run("upload_metadata", server, metadata, 2 * len(locales), args.max_rate))
+        results.append(run("version_flow", server, version_flow, 4, args.max_rate))
+
+    print(f"\n{'scenario':30} {'ok':>3} {'secs':>8} {'reqs':>6} {'req/s':>8} {'units/s':>8} {'p50ms':>7} {'p95ms':>7}")
+    for r in results:
+        print(f"{r['name']:30} {'✅' if r['ok'] else '❌':>2} {r['seconds']:8.2f} {r['requests']:6d} "
+              f"{r['requests_per_second']:8.1f} {r['units_per_second']:8.1f} {r['p50_ms']:7.1f} {r['p95_ms']:7.1f}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,21 @@
 """Build and Upload"""
 
+import os
 import subprocess
 from pathlib import Path
+from typing import Optional, List
 from .config import (
     XCODE_SCHEME, ARCHIVE_PATH, EXPORT_PATH,
     IPA_NAME, EXPORT_OPTIONS, KEY_ID, ISSUER_ID
 )
+from .build_cache import build_key, restore_artifact, store_artifact
+from .steps import Step, StepGraph
+from .runner import run_command, print_phases
+from .api import AppStoreAPI
+from .bundle import get_app_id
+from .version import create_version
+from .metadata import upload_metadata, upload_version_metadata
+from .screenshots import upload_screenshots
 
 
 def update_version_numbers(version: str, build_number: str) -> bool:
@@ -30,51 +40,65 @@ def update_version_numbers(version: str, build_number: str) -> bool:
         return False
 
 
-def build_archive() -> bool:
-    """Build Xcode archive"""
+def build_archive(cache_key: Optional[str] = None) -> bool:
+    """Build Xcode archive, or reuse the cached one built from the same sources"""
+    if cache_key and restore_artifact(cache_key, ARCHIVE_PATH):
+        print(f"\n♻️  Sources unchanged, reusing cached archive ({cache_key[:12]})")
+        return True
+
     print(f"\n🔨 Building archive...")
 
     # Clean build directory
     Path("build").mkdir(exist_ok=True)
 
-    try:
-        result = subprocess.run([
-            "xcodebuild",
-            "-scheme", XCODE_SCHEME,
-            "-configuration", "Release",
-            "-archivePath", ARCHIVE_PATH,
-            "-destination", "generic/platform=iOS",
-            "archive"
-        ], check=True, capture_output=True, text=True)
-
-        print(f"✅ Archive built successfully")
-        return True
-    except subprocess.CalledProcessError as e:
+    result = run_command([
+        "xcodebuild",
+        "-scheme", XCODE_SCHEME,
+        "-configuration", "Release",
+        "-archivePath", ARCHIVE_PATH,
+        "-destination", "generic/platform=iOS",
+        "archive"
+    ])
+
+    if not result.ok:
         print(f"❌ Build failed:")
-        print(e.stderr)
+        result.print_failure()
         return False
 
+    print(f"✅ Archive built successfully in {result.seconds:.1f}s")
+    print_phases(result)
+    if cache_key:
+        store_artifact(cache_key, ARCHIVE_PATH)
+    return True
 
-def export_ipa() -> bool:
-    """Export IPA from archive"""
-    print(f"\n📦 Exporting IPA...")
 
-    try:
-        result = subprocess.run([
-            "xcodebuild",
-            "-exportArchive",
-            "-archivePath", ARCHIVE_PATH,
-            "-exportPath", EXPORT_PATH,
-            "-exportOptionsPlist", EXPORT_OPTIONS
-        ], check=True, capture_output=True, text=True)
-
-        print(f"✅ IPA exported successfully")
+def export_ipa(cache_key: Optional[str] = None) -> bool:
+    """Export IPA from archive, or reuse the cached one exported from the same sources"""
+    ipa_path = f"{EXPORT_PATH}/{IPA_NAME}"
+    if cache_key and restore_artifact(cache_key, ipa_path):
+        print(f"\n♻️  Sources unchanged, reusing cached IPA ({cache_key[:12]})")
         return True
-    except subprocess.CalledProcessError as e:
+
+    print(f"\n📦 Exporting IPA...")
+
+    result = run_command([
+        "xcodebuild",
+        "-exportArchive",
+        "-archivePath", ARCHIVE_PATH,
+        "-exportPath", EXPORT_PATH,
+        "-exportOptionsPlist", EXPORT_OPTIONS
+    ])
+
+    if not result.ok:
         print(f"❌ Export failed:")
-        print(e.stderr)
+        result.print_failure()
         return False
 
+    print(f"✅ IPA exported successfully in {result.seconds:.1f}s")
+    if cache_key:
+        store_artifact(cache_key, ipa_path)
+    return True
+
 
 def upload_build() -> bool:
     """Upload IPA to App Store Connect using altool"""
@@ -86,40 +110,77 @@ def upload_build() -> bool:
         print(f"❌ IPA not found: {ipa_path}")
         return False
 
-    try:
-        # Set environment variable for API key location
-        env = {"API_PRIVATE_KEYS_DIR": "./deployment"}
-
-        result = subprocess.run([
-            "xcrun", "altool",
-            "--upload-app",
-            "-f", ipa_path,
-            "--type", "ios",
-            "--apiKey", KEY_ID,
-            "--apiIssuer", ISSUER_ID
-        ], check=True, capture_output=True, text=True, env={**subprocess.os.environ, **env})
-
-        print("✅ Build uploaded successfully")
-        print("   Processing may take a few minutes in App Store Connect")
-        return True
-    except subprocess.CalledProcessError as e:
+    # Set environment variable for API key location
+    env = {"API_PRIVATE_KEYS_DIR": "./deployment"}
+
+    result = run_command([
+        "xcrun", "altool",
+        "--upload-app",
+        "-f", ipa_path,
+        "--type", "ios",
+        "--apiKey", KEY_ID,
+        "--apiIssuer", ISSUER_ID
+    ], env={**os.environ, **env})
+
+    if not result.ok:
         print(f"❌ Upload failed:")
-        print(e.stderr)
+        result.print_failure()
         return False
 
+    print(f"✅ Build uploaded successfully in {result.seconds:.1f}s")
+    print("   Processing may take a few minutes in App Store Connect")
+    return True
+
+
+def build_steps(version: str, build_number: str, api: Optional[AppStoreAPI] = None) -> List[Step]:
+    """
+    The release flow as a dependency graph
+
+    The build chain is serial (version bump → archive → export → upload). With an
+    API client the App Store listing (version, metadata, screenshots) is synced
+    alongside it, since none of it needs the build.
+    """
+    def update_versions(context):
+        return update_version_numbers(version, build_number)
+
+    def archive(context):
+        # Hashed after the version update so the project file is in its final state
+        context["cache_key"] = build_key(version, build_number)
+        return build_archive(context["cache_key"])
 
-def build_and_upload(version: str, build_number: str) -> bool:
-    """Complete build and upload workflow"""
     steps = [
-        ("Update version numbers", lambda: update_version_numbers(version, build_number)),
-        ("Build archive", build_archive),
-        ("Export IPA", export_ipa),
-        ("Upload to App Store", upload_build)
+        Step("Update version numbers", update_versions, outputs=["project"]),
+        Step("Build archive", archive, inputs=["project"], outputs=["archive", "cache_key"]),
+        Step("Export IPA", lambda context: export_ipa(context["cache_key"]), inputs=["archive", "cache_key"],
+             outputs=["ipa"]),
+        Step("Upload to App Store", lambda context: upload_build(), inputs=["ipa"], outputs=["build"]),
+    ]
+    if api is None:
+        return steps
+
+    def find_app(context):
+        context["app_id"] = get_app_id(api)
+        return bool(context["app_id"])
+
+    def version_record(context):
+        context["version_id"] = create_version(api, context["app_id"], version, upload_metadata=False)
+        return bool(context["version_id"])
+
+    return steps + [
+        Step("Find app", find_app, outputs=["app_id"]),
+        Step("Create version", version_record, inputs=["app_id"], outputs=["version_id"]),
+        Step("Upload app info metadata", lambda context: upload_metadata(api, context["app_id"]),
+             inputs=["app_id"]),
+        Step("Upload version metadata", lambda context: upload_version_metadata(api, context["version_id"]),
+             inputs=["version_id"]),
+        Step("Upload screenshots", lambda context: upload_screenshots(api, context["version_id"]),
+             inputs=["version_id"]),
     ]
 
-    for step_name, step_func in steps:
-        if not step_func():
-            print(f"\n❌ Build failed at: {step_name}")
-            return False
 
-    return True
+def build_and_upload(version: str, build_number: str, api: Optional[AppStoreAPI] = None) -> bool:
+    """Complete build and upload workflow, independent steps in parallel"""
+    graph = StepGraph(build_steps(version, build_number, api))
+    success = graph.run()
+    graph.print_summary()
+    return success
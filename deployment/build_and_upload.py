@@ -2,10 +2,12 @@
 """
 Build and Upload Slideshow Cast to App Store Connect
 
-This script builds the app and uploads it to App Store Connect.
+This script builds the app and uploads it to App Store Connect. With
+--listing it also creates the version and uploads metadata and screenshots
+while the build runs.
 
 Usage:
-    python3 build_and_upload.py [version] [build_number]
+    python3 build_and_upload.py [version] [build_number] [--listing]
 
 Example:
     python3 build_and_upload.py 1.0 1
@@ -21,7 +23,10 @@ from deployment.build import build_and_upload
 from deployment.config import APP_NAME, BUNDLE_ID
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    listing = "--listing" in argv
+    argv = [arg for arg in argv if arg != "--listing"]
     print("=" * 60)
     print("🚀 Slideshow Cast Build & Upload")
     print("=" * 60)
@@ -30,9 +35,9 @@ def main():
     print()
 
     # Get version and build number
-    if len(sys.argv) >= 3:
-        version = sys.argv[1]
-        build_number = sys.argv[2]
+    if len(argv) >= 3:
+        version = argv[1]
+        build_number = argv[2]
     else:
         version = input("Version number (e.g., 1.0): ").strip()
         build_number = input("Build number (e.g., 1): ").strip()
@@ -44,8 +49,13 @@ def main():
     print(f"\n📦 Building version {version} (build {build_number})")
     print()
 
+    api = None
     try:
-        if build_and_upload(version, build_number):
+        if listing:
+            from deployment.api import AppStoreAPI
+            api = AppStoreAPI()
+
+        if build_and_upload(version, build_number, api):
             print("\n" + "=" * 60)
             print("✅ SUCCESS!")
             print("=" * 60)
@@ -75,6 +85,10 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        if api is not None:
+            api.close()
+            api.metrics.export("build_and_upload")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""Content-addressed Cache of Xcode archives and exported IPAs"""
+
+import os
+import json
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Optional, List, Iterable
+from .config import BUILD_SOURCES, EXPORT_OPTIONS, BUILD_CACHE_DIR
+from .hashes import get_hash_cache
+
+# Builds kept in the cache; older ones are deleted when a new one is stored
+BUILD_CACHE_ENTRIES = 3
+# Editor state that changes without changing what gets built
+IGNORED_NAMES = {".DS_Store", "xcuserdata"}
+
+
+def source_files(roots: Iterable[str]) -> List[str]:
+    """Every file under the given files/directories, in a stable order"""
+    files = []
+    pending = [root for root in roots if os.path.exists(root)]
+    while pending:
+        path = pending.pop()
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name in IGNORED_NAMES:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry.path)
+    return sorted(files)
+
+
+def build_key(version: str, build_number: str, sources: Iterable[str] = (*BUILD_SOURCES, EXPORT_OPTIONS),
+              workers: Optional[int] = None) -> str:
+    """
+    SHA-256 over every source file's path and MD5 plus the version and build numbers
+
+    File checksums come from the persistent hash cache, so an unchanged tree
+    costs one stat() per file; large batches of changed files hash in a thread pool.
+    """
+    files = source_files(sources)
+    infos = get_hash_cache().file_infos(files, workers)
+
+    digest = hashlib.sha256(json.dumps({"version": version, "build_number": build_number}).encode())
+    for file_path in files:
+        digest.update(f"{Path(file_path).as_posix()}\0{infos[file_path][1]}\n".encode())
+    return digest.hexdigest()
+
+
+def cached_artifact(key: str, name: str) -> Optional[str]:
+    """Path of a cached archive or IPA for a build key, or None"""
+    path = Path(BUILD_CACHE_DIR) / key / name
+    return str(path) if path.exists() else None
+
+
+def copy_artifact(source: str, destination: str):
+    """Replace destination with a copy of a file or bundle directory, atomically renamed into place"""
+    partial = f"{destination}.partial"
+    shutil.rmtree(partial, ignore_errors=True)
+    Path(destination).parent.mkdir(parents=True, exist_ok=True)
+    if os.path.isdir(source):
+        shutil.copytree(source, partial, symlinks=True)
+        shutil.rmtree(destination, ignore_errors=True)
+    else:
+        shutil.copy2(source, partial)
+    os.replace(partial, destination)
+
+
+def restore_artifact(key: str, destination: str) -> bool:
+    """Copy a cached artifact (named like destination) into place; False on a miss"""
+    cached = cached_artifact(key, Path(destination).name)
+    if not cached:
+        return False
+    copy_artifact(cached, destination)
+    # Mark the entry as recently used so pruning keeps it
+    os.utime(Path(cached).parent)
+    return True
+
+
+def store_artifact(key: str, source: str):
+    """Copy a freshly built artifact into the cache and drop the oldest builds"""
+    copy_artifact(source, str(Path(BUILD_CACHE_DIR) / key / Path(source).name))
+    prune()
+
+
+def prune(keep: int = BUILD_CACHE_ENTRIES):
+    """Delete all but the most recently used builds"""
+    root = Path(BUILD_CACHE_DIR)
+    if not root.exists():
+        return
+    entries = sorted((entry for entry in root.iterdir() if entry.is_dir()),
+                     key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        shutil.rmtree(entry, ignore_errors=True)
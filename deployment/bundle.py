@@ -12,8 +12,9 @@ def register_bundle_id(api: AppStoreAPI) -> bool:
     print(f"\n🔧 Registering Bundle ID: {BUNDLE_ID}")
 
     # Check if exists first
-    result = api.get(f"bundleIds?filter[identifier]={BUNDLE_ID}")
-    if result.get("data"):
+    existing = next(api.iter(f"bundleIds?filter[identifier]={BUNDLE_ID}",
+                             fields={"bundleIds": "identifier"}, limit=1), None)
+    if existing:
         print(f"✅ Bundle ID already registered")
         return True
 
@@ -44,10 +45,10 @@ def get_app_id(api: AppStoreAPI) -> str:
     Returns app_id or None if not found
     """
     print(f"\n🔍 Looking for app: {BUNDLE_ID}")
-    result = api.get(f"apps?filter[bundleId]={BUNDLE_ID}")
+    app = next(api.iter(f"apps?filter[bundleId]={BUNDLE_ID}", fields={"apps": "bundleId"}, limit=1), None)
 
-    if result.get("data") and len(result["data"]) > 0:
-        app_id = result["data"][0]["id"]
+    if app:
+        app_id = app["id"]
         print(f"✅ Found app: {app_id}")
         return app_id
 
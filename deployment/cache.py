@@ -0,0 +1,123 @@
+"""Persistent Response Cache for App Store Connect GET requests"""
+
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from typing import Optional, Dict, Any, List, Tuple
+from .config import CACHE_PATH
+
+# Seconds a cached response is served without asking the server, keyed by
+# the resource type the endpoint returns
+DEFAULT_TTL = 300
+TTLS = {
+    "bundleIds": 86400,
+    "apps": 86400,
+    "appInfos": 3600,
+    "appInfoLocalizations": 600,
+    "appStoreVersions": 300,
+    "appStoreVersionLocalizations": 600,
+    "appScreenshotSets": 300,
+    "appScreenshots": 60,
+    "builds": 60,
+}
+
+
+def resource_types(url: str) -> List[str]:
+    """
+    Resource types a URL touches, e.g. 'apps/1/appInfos?include=appInfoLocalizations'
+    -> ['apps', 'appInfos', 'appInfoLocalizations']
+    """
+    parts = urlsplit(url)
+    segments = [s for s in parts.path.split("/") if s and s not in ("v1", "relationships")]
+    types = segments[0::2]
+
+    for include in parse_qs(parts.query).get("include", []):
+        for name in include.split(","):
+            types.append(name.split(".")[-1])
+
+    return list(dict.fromkeys(types))
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of GET responses keyed by URL
+
+    Entries are fresh for a per-endpoint TTL, then revalidated with
+    If-None-Match when the server sent an ETag. Any mutation of a resource
+    type drops every cached URL that touches that type.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, ttls: Optional[Dict[str, int]] = None):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = {**TTLS, **(ttls or {})}
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, body TEXT, etag TEXT, expires REAL, types TEXT)"
+        )
+        self._db.commit()
+
+    def ttl_for(self, url: str) -> int:
+        """TTL of the resource type the URL returns"""
+        types = [t for t in urlsplit(url).path.split("/") if t and t not in ("v1", "relationships")][0::2]
+        return self.ttls.get(types[-1], DEFAULT_TTL) if types else DEFAULT_TTL
+
+    def lookup(self, url: str) -> Tuple[Optional[Dict[Any, Any]], Optional[str], bool]:
+        """Return (body, etag, fresh) for a URL; body is None on a miss"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, expires FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None, None, False
+
+            body, etag, expires = row
+            fresh = expires > time.time()
+            if fresh:
+                self.hits += 1
+        return json.loads(body), etag, fresh
+
+    def store(self, url: str, body: Dict[Any, Any], etag: Optional[str] = None):
+        """Cache a successful response"""
+        types = "," + ",".join(resource_types(url)) + ","
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (url, body, etag, expires, types) VALUES (?, ?, ?, ?, ?)",
+                (url, json.dumps(body), etag, time.time() + self.ttl_for(url), types)
+            )
+            self._db.commit()
+
+    def refresh(self, url: str):
+        """Extend an entry's lifetime after a 304 Not Modified"""
+        self.revalidated += 1
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET expires = ? WHERE url = ?", (time.time() + self.ttl_for(url), url)
+            )
+            self._db.commit()
+
+    def invalidate(self, url: str):
+        """Drop every entry touching a resource type the URL mutates"""
+        with self._lock:
+            for resource_type in resource_types(url):
+                self._db.execute("DELETE FROM responses WHERE types LIKE ?", (f"%,{resource_type},%",))
+            self._db.commit()
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,196 @@
+"""Record/Replay Transport for Offline Runs"""
+
+import json
+import time
+import atexit
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Union, Tuple, Deque
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Header values never written to a cassette
+SCRUBBED_HEADERS = {"authorization", "cookie", "set-cookie", "x-apple-jwt"}
+SCRUBBED = "<scrubbed>"
+# Request bodies larger than this (asset parts) are stored as a size only
+MAX_STORED_BODY = 64 * 1024
+
+
+class CassetteError(Exception):
+    """A replayed request has no matching recorded interaction"""
+
+
+def scrub_headers(headers) -> Dict[str, str]:
+    """Copy headers with credentials replaced"""
+    return {
+        name: SCRUBBED if name.lower() in SCRUBBED_HEADERS else value
+        for name, value in headers.items()
+    }
+
+
+def body_text(body) -> Tuple[Optional[str], int]:
+    """Storable form of a request body: (text or None, size in bytes)"""
+    if body is None:
+        return None, 0
+    if isinstance(body, str):
+        body = body.encode()
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        size = len(body) if not isinstance(body, memoryview) else body.nbytes
+        if size > MAX_STORED_BODY:
+            return None, size
+        try:
+            return bytes(body).decode(), size
+        except UnicodeDecodeError:
+            return None, size
+    if hasattr(body, "__len__"):
+        return None, len(body)  # Streamed file body: only its size is kept
+    return None, 0
+
+
+class Cassette:
+    """
+    A file of recorded HTTP interactions
+
+    In "record" mode requests go to the network and each request/response
+    pair is captured with credentials scrubbed. In "replay" mode nothing
+    touches the network: requests are answered from the file in recorded
+    order per (method, URL), after an optional simulated latency.
+
+    Args:
+        path: Cassette JSON file
+        mode: "record" or "replay"
+        latency: Seconds to wait per replayed request, or "recorded" to
+            reuse each interaction's original duration
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency: Union[float, str] = 0.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.interactions: List[Dict[str, Any]] = []
+        self._queues: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self.interactions = json.loads(self.path.read_text())["interactions"]
+            for interaction in self.interactions:
+                key = (interaction["request"]["method"], interaction["request"]["url"])
+                self._queues.setdefault(key, deque()).append(interaction)
+        else:
+            atexit.register(self.save)
+
+    def adapter(self, inner: HTTPAdapter) -> BaseAdapter:
+        """Transport adapter to mount on a session"""
+        if self.mode == "record":
+            return RecordingAdapter(self, inner)
+        return ReplayAdapter(self)
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response, elapsed: float):
+        """Capture one interaction"""
+        text, size = body_text(request.body)
+        interaction = {
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "headers": scrub_headers(request.headers),
+                "body": text,
+                "body_size": size
+            },
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": scrub_headers(response.headers),
+                "body": response.content.decode("utf-8", errors="replace")
+            },
+            "elapsed": elapsed
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def next_interaction(self, request: requests.PreparedRequest) -> Dict[str, Any]:
+        """Pop the next recorded interaction for this request"""
+        with self._lock:
+            queue = self._queues.get((request.method, request.url))
+            if not queue:
+                raise CassetteError(f"No recorded response for {request.method} {request.url}")
+            return queue.popleft()
+
+    def save(self):
+        """Write recorded interactions to the cassette file"""
+        if self.mode != "record":
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps({"interactions": self.interactions}, indent=1))
+
+
+class RecordingAdapter(BaseAdapter):
+    """Sends requests for real and records them into a cassette"""
+
+    def __init__(self, cassette: Cassette, inner: HTTPAdapter):
+        super().__init__()
+        self.cassette = cassette
+        self.inner = inner
+        self.poolmanager = inner.poolmanager
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = self.inner.send(request, **kwargs)
+        self.cassette.record(request, response, time.perf_counter() - start)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests from a cassette without touching the network"""
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        interaction = self.cassette.next_interaction(request)
+
+        delay = interaction.get("elapsed", 0.0) if self.cassette.latency == "recorded" else self.cassette.latency
+        if delay:
+            time.sleep(delay)
+
+        recorded = interaction["response"]
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response._content = recorded["body"].encode()
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def cassette_from_args(argv: List[str]) -> Optional[Cassette]:
+    """Build a cassette from --record FILE / --replay FILE [--latency SECONDS|recorded]"""
+    def option(name: str) -> Optional[str]:
+        if name in argv and argv.index(name) + 1 < len(argv):
+            return argv[argv.index(name) + 1]
+        return None
+
+    latency = option("--latency") or 0.0
+    if latency not in (0.0, "recorded"):
+        latency = float(latency)
+
+    if option("--record"):
+        return Cassette(option("--record"), mode="record")
+    if option("--replay"):
+        return Cassette(option("--replay"), mode="replay", latency=latency)
+    return None
@@ -0,0 +1,137 @@
+"""
+slidecast-deploy: one entry point for the deployment flows
+
+Only argparse is imported up front. Each subcommand imports its own modules
+(requests, jwt, the crypto backend, the API client) when it runs, so --help
+and typos return immediately and credentials are only read when a request
+is actually signed.
+
+Usage:
+    python3 -m deployment <command> [options]
+    ./slidecast-deploy <command> [options]
+"""
+
+import sys
+import argparse
+
+
+def _add_api_options(parser: argparse.ArgumentParser):
+    """Options shared by the commands that talk to App Store Connect"""
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse cached API lookups from previous runs (build/cache/api.sqlite)")
+    parser.add_argument("--record", metavar="FILE", help="Record requests/responses to a cassette")
+    parser.add_argument("--replay", metavar="FILE", help="Run offline against a recorded cassette")
+    parser.add_argument("--latency", metavar="SECONDS",
+                        help='Simulated seconds per replayed request, or "recorded"')
+
+
+def _api_argv(args: argparse.Namespace) -> list:
+    """Turn parsed API options back into the flags the flow scripts read"""
+    argv = []
+    if args.cache:
+        argv.append("--cache")
+    for option in ("record", "replay", "latency"):
+        if getattr(args, option):
+            argv += [f"--{option}", getattr(args, option)]
+    return argv
+
+
+def _register_bundle(args: argparse.Namespace) -> int:
+    from deployment.register_bundle import main
+    return main(["register-bundle"])
+
+
+def _metadata(args: argparse.Namespace) -> int:
+    from deployment.upload_metadata import main
+    return main(["metadata", *_api_argv(args)])
+
+
+def _screenshots(args: argparse.Namespace) -> int:
+    from deployment.upload_screenshots import main
+    return main(["screenshots", *_api_argv(args)])
+
+
+def _plan(args: argparse.Namespace) -> int:
+    from deployment.api import AppStoreAPI
+    from deployment.cache import ResponseCache
+    from deployment.cassette import cassette_from_args
+    from deployment.plan import build_plan
+
+    api = None
+    try:
+        api = AppStoreAPI(cache=ResponseCache() if args.cache else None,
+                          cassette=cassette_from_args(_api_argv(args)))
+        plan = build_plan(api, args.metadata_dir, args.screenshots_dir, args.version)
+        if plan is None:
+            return 1
+        plan.print()
+
+        if args.command == "apply" and plan.changes:
+            if not plan.apply(api):
+                return 1
+            print("\n✅ Applied")
+        return 0
+    finally:
+        if api:
+            api.close()
+            api.metrics.export(args.command)
+
+
+def _build(args: argparse.Namespace) -> int:
+    from deployment.build_and_upload import main
+    return main(["build", *([args.version, args.build_number] if args.version else []),
+                 *(["--listing"] if args.listing else [])])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser for every subcommand (cheap: imports nothing heavy)"""
+    parser = argparse.ArgumentParser(
+        prog="slidecast-deploy",
+        description="SlideCast App Store Connect deployment"
+    )
+    commands = parser.add_subparsers(dest="command", metavar="<command>")
+    commands.required = True
+
+    command = commands.add_parser("register-bundle", help="Register the bundle ID in the Developer Portal")
+    command.set_defaults(handler=_register_bundle)
+
+    command = commands.add_parser("metadata", help="Upload app info and version metadata")
+    _add_api_options(command)
+    command.set_defaults(handler=_metadata)
+
+    command = commands.add_parser("screenshots", help="Upload screenshots for the version in preparation")
+    _add_api_options(command)
+    command.set_defaults(handler=_screenshots)
+
+    for name, help_text in (("plan", "Show what apply would change on App Store Connect"),
+                            ("apply", "Send only the changes between local files and App Store Connect")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--metadata-dir", default="deployment/metadata/en-US",
+                             help="Locale folder to plan; its name (e.g. en-US) picks the localization")
+        command.add_argument("--screenshots-dir", default="deployment/screenshots/en-US",
+                             help="Screenshots for the same locale")
+        command.add_argument("--version", help="Desired version string of the version in preparation")
+        _add_api_options(command)
+        command.set_defaults(handler=_plan)
+
+    command = commands.add_parser("build", help="Archive, export and upload a build")
+    command.add_argument("version", nargs="?", help="Marketing version, e.g. 1.0")
+    command.add_argument("build_number", nargs="?", help="Build number, e.g. 1")
+    command.add_argument("--listing", action="store_true",
+                         help="Also create the version and upload metadata and screenshots while building")
+    command.set_defaults(handler=_build)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Cancelled by user")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,3 +20,16 @@ ARCHIVE_PATH = "build/SlideCast.xcarchive"
 EXPORT_PATH = "build"
 IPA_NAME = "MemorySlideshow.ipa"
 EXPORT_OPTIONS = "deployment/ExportOptions.plist"
+BUILD_SOURCES = ("MemorySlideshow", "MemorySlideshow.xcodeproj")  # Inputs that decide what xcodebuild produces
+
+# HTTP Configuration
+POOL_SIZE = 10  # Keep-alive connections per host
+CACHE_PATH = "build/cache/api.sqlite"  # Opt-in GET response cache
+HASH_CACHE_PATH = "build/cache/hashes.sqlite"  # File checksums keyed by (path, size, mtime_ns, inode)
+JOURNAL_PATH = "build/cache/uploads.sqlite"  # Reserved screenshots and uploaded parts, for resuming
+OPTIMIZED_DIR = "build/cache/optimized"  # Losslessly optimized screenshots, by source MD5
+BUILD_CACHE_DIR = "build/cache/builds"  # Archives and IPAs, by source tree hash
+METRICS_DIR = "build/metrics"  # Per-run request metrics (NDJSON + Prometheus)
+UPLOAD_CONCURRENCY = 8  # Screenshot reserve/upload/commit/delete steps in flight at once
+PART_CONCURRENCY = 4  # Upload parts of one asset in flight at once
+LOCALE_CONCURRENCY = 4  # Locales synced at once (they share UPLOAD_CONCURRENCY)
@@ -0,0 +1,139 @@
+"""Persistent File Checksum Cache for screenshots, previews and build artifacts"""
+
+import os
+import mmap
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
+from .config import HASH_CACHE_PATH
+
+# Files at least this big are hashed through a memory map instead of read() calls
+MMAP_THRESHOLD = 1 << 20
+READ_BUFFER = 1 << 20
+# Cache misses are hashed in a thread pool (hashlib releases the GIL) once they add up to this many bytes
+PARALLEL_BYTES = 64 << 20
+
+
+def md5_file(file_path: str) -> str:
+    """MD5 hex digest of a file, read in large blocks or mapped into memory"""
+    md5_hash = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                md5_hash.update(mapped)
+        else:
+            for chunk in iter(lambda: f.read(READ_BUFFER), b''):
+                md5_hash.update(chunk)
+    return md5_hash.hexdigest()
+
+
+def file_key(file_path: str) -> Tuple[str, int, int, int]:
+    """(path, size, mtime_ns, inode): changes whenever the file's content may have"""
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class HashCache:
+    """
+    SQLite-backed MD5 cache keyed by (path, size, mtime_ns, inode)
+
+    A file is hashed again only when one of those changes, so an unchanged
+    asset folder costs one stat() per file. Safe to share between threads.
+    """
+
+    def __init__(self, path: str = HASH_CACHE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS checksums ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, md5 TEXT)"
+        )
+        self._db.commit()
+
+    def lookup(self, file_path: str) -> Tuple[Tuple[str, int, int, int], Optional[str]]:
+        """Return (key, md5) for a file; md5 is None unless cached for its current stat"""
+        key = file_key(file_path)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, mtime_ns, inode, md5 FROM checksums WHERE path = ?", (key[0],)
+            ).fetchone()
+
+        if row and tuple(row[:3]) == key[1:]:
+            self.hits += 1
+            return key, row[3]
+        self.misses += 1
+        return key, None
+
+    def store(self, key: Tuple[str, int, int, int], md5: str):
+        """
+        Cache a checksum under the key returned by lookup() before hashing: a
+        file modified meanwhile no longer matches it and is hashed again next time
+        """
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO checksums (path, size, mtime_ns, inode, md5) VALUES (?, ?, ?, ?, ?)",
+                (*key, md5)
+            )
+            self._db.commit()
+
+    def file_infos(self, file_paths: List[str], workers: Optional[int] = None) -> Dict[str, Tuple[int, str]]:
+        """
+        (size, md5) for each file, hashing only files that changed since they were cached
+
+        Args:
+            file_paths: Files to checksum
+            workers: Thread pool size for large batches of misses (default: CPU count)
+        """
+        keys = {}
+        infos = {}
+        for file_path in dict.fromkeys(file_paths):
+            keys[file_path], md5 = self.lookup(file_path)
+            if md5:
+                infos[file_path] = (keys[file_path][1], md5)
+
+        misses = [file_path for file_path in keys if file_path not in infos]
+        if len(misses) > 1 and sum(keys[file_path][1] for file_path in misses) >= PARALLEL_BYTES:
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+                digests = list(executor.map(md5_file, misses))
+        else:
+            digests = [md5_file(file_path) for file_path in misses]
+
+        for file_path, digest in zip(misses, digests):
+            self.store(keys[file_path], digest)
+            infos[file_path] = (keys[file_path][1], digest)
+
+        return infos
+
+    def file_info(self, file_path: str) -> Tuple[int, str]:
+        """(size, md5) of one file"""
+        return self.file_infos([file_path])[file_path]
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._db.execute("DELETE FROM checksums")
+            self._db.commit()
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+
+_hash_cache: Optional[HashCache] = None
+_hash_cache_lock = threading.Lock()
+
+
+def get_hash_cache() -> HashCache:
+    """Return the process-wide HashCache"""
+    global _hash_cache
+    with _hash_cache_lock:
+        if _hash_cache is None:
+            _hash_cache = HashCache()
+        return _hash_cache
@@ -0,0 +1,154 @@
+"""Screenshot Validation and Lossless PNG Optimization"""
+
+import os
+import zlib
+import struct
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
+from .config import OPTIMIZED_DIR
+from .hashes import get_hash_cache
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Pixel sizes App Store Connect accepts per display key (portrait; landscape is the same swapped)
+SCREENSHOT_SIZES = {
+    "iphone67": [(1320, 2868), (1290, 2796)],
+    "iphone65": [(1284, 2778), (1242, 2688)],
+    "iphone61": [(1179, 2556), (1170, 2532)],
+    "ipad": [(2064, 2752), (2048, 2732)],
+}
+
+# Chunks that carry pixels or affect how they render; everything else
+# (text, timestamps, EXIF, physical size, ...) is metadata and is dropped
+KEEP_CHUNKS = {b"IHDR", b"PLTE", b"tRNS", b"IDAT", b"IEND", b"gAMA", b"cHRM", b"sRGB", b"iCCP", b"sBIT"}
+# Animated PNGs are left untouched
+ANIMATION_CHUNKS = {b"acTL", b"fcTL", b"fdAT"}
+IDAT_SIZE = 1 << 20
+
+
+def png_dimensions(file_path: str) -> Optional[Tuple[int, int]]:
+    """(width, height) from a PNG's IHDR chunk without decoding the image, or None if not a PNG"""
+    with open(file_path, 'rb') as f:
+        header = f.read(24)
+    if len(header) < 24 or header[:8] != PNG_SIGNATURE or header[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def validate_screenshots(groups: Dict[str, List[str]]) -> List[str]:
+    """
+    Check every screenshot's pixel size against its display key
+
+    Args:
+        groups: {display_key: [file_path, ...]} as returned by group_screenshots
+
+    Returns:
+        One message per rejected file (empty when all are valid)
+    """
+    errors = []
+    for display_key, files in groups.items():
+        allowed = SCREENSHOT_SIZES[display_key]
+        allowed = allowed + [(height, width) for width, height in allowed]
+        for file_path in files:
+            size = png_dimensions(file_path)
+            if size is None:
+                errors.append(f"{Path(file_path).name}: not a PNG file")
+            elif size not in allowed:
+                expected = ", ".join(f"{width}x{height}" for width, height in SCREENSHOT_SIZES[display_key])
+                errors.append(f"{Path(file_path).name}: {size[0]}x{size[1]} is not an accepted {display_key} size ({expected})")
+    return errors
+
+
+def read_chunks(data: bytes) -> Optional[List[Tuple[bytes, bytes]]]:
+    """Split a PNG into (type, payload) chunks, or None if it is malformed"""
+    if data[:8] != PNG_SIGNATURE:
+        return None
+
+    chunks = []
+    position = 8
+    while position + 12 <= len(data):
+        length, kind = struct.unpack(">I4s", data[position:position + 8])
+        payload = data[position + 8:position + 8 + length]
+        crc = data[position + 8 + length:position + 12 + length]
+        if len(payload) != length or struct.pack(">I", zlib.crc32(kind + payload)) != crc:
+            return None
+        chunks.append((kind, payload))
+        position += 12 + length
+        if kind == b"IEND":
+            return chunks
+    return None
+
+
+def write_chunk(kind: bytes, payload: bytes) -> bytes:
+    """Serialize one PNG chunk"""
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+
+def optimize_png(source: str, destination: str) -> str:
+    """
+    Losslessly shrink a PNG: drop metadata chunks and recompress the image
+    data at maximum zlib effort (pixels and filters are untouched)
+
+    Writes the smaller of the result and the original to destination and returns it.
+    """
+    data = Path(source).read_bytes()
+    chunks = read_chunks(data)
+    output = data
+
+    if chunks and not any(kind in ANIMATION_CHUNKS for kind, _ in chunks):
+        pixels = zlib.decompress(b"".join(payload for kind, payload in chunks if kind == b"IDAT"))
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9)
+        compressed = compressor.compress(pixels) + compressor.flush()
+
+        optimized = [PNG_SIGNATURE]
+        for kind, payload in chunks:
+            if kind == b"IDAT":
+                if compressed is not None:
+                    optimized += [write_chunk(b"IDAT", compressed[i:i + IDAT_SIZE])
+                                  for i in range(0, len(compressed), IDAT_SIZE)]
+                    compressed = None  # Written once, where the first IDAT was
+            elif kind in KEEP_CHUNKS:
+                optimized.append(write_chunk(kind, payload))
+
+        candidate = b"".join(optimized)
+        if len(candidate) < len(data):
+            output = candidate
+
+    Path(destination).parent.mkdir(parents=True, exist_ok=True)
+    # Locales often share screenshots, so several workers may write the same
+    # output at once; each writes its own temporary file and the rename is atomic
+    partial = f"{destination}.{os.getpid()}.{threading.get_ident()}.partial"
+    Path(partial).write_bytes(output)
+    os.replace(partial, destination)
+    return destination
+
+
+def optimize_screenshots(files: List[str], output_dir: str = OPTIMIZED_DIR,
+                         workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Optimized copy of each screenshot, produced once per distinct content
+
+    Outputs live at <output_dir>/<source md5>/<original filename>, so the
+    uploaded file name is unchanged and a file is only optimized again when
+    its content changes. Misses run in a thread pool (zlib releases the GIL).
+
+    Returns:
+        {source path: optimized path}
+    """
+    infos = get_hash_cache().file_infos(files)
+    outputs = {
+        file_path: str(Path(output_dir) / infos[file_path][1] / Path(file_path).name)
+        for file_path in files
+    }
+
+    missing = {file_path: output for file_path, output in outputs.items() if not os.path.exists(output)}
+    if len(missing) > 1:
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            list(executor.map(optimize_png, missing.keys(), missing.values()))
+    else:
+        for file_path, output in missing.items():
+            optimize_png(file_path, output)
+
+    return outputs
@@ -0,0 +1,129 @@
+"""On-disk Upload Journal so interrupted screenshot uploads can resume"""
+
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Tuple
+from .config import JOURNAL_PATH
+
+# Upload operation URLs are presigned and stop working after a while; older
+# reservations are deleted and reserved again instead of resumed
+RESERVATION_LIFETIME = 6 * 3600
+
+
+class UploadJournal:
+    """
+    SQLite-backed record of reserved screenshots and their uploaded parts
+
+    Each reservation is stored with its upload operations, the file's
+    (path, size, mtime_ns, inode) key and checksum when known, and every part
+    that has been PUT. A later run resumes a reservation only if the file is
+    unchanged and the reservation has not expired. Safe to share between threads.
+    """
+
+    def __init__(self, path: str = JOURNAL_PATH, lifetime: int = RESERVATION_LIFETIME):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lifetime = lifetime
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS reservations ("
+            "screenshot_id TEXT PRIMARY KEY, set_id TEXT, file_key TEXT, checksum TEXT, "
+            "operations TEXT, reserved_at REAL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS parts (screenshot_id TEXT, offset INTEGER, PRIMARY KEY (screenshot_id, offset))"
+        )
+        self._db.commit()
+        self.expire()
+
+    def reserved(self, screenshot_id: str, set_id: str, file_key: Tuple, checksum: Optional[str],
+                 operations: List[Dict]):
+        """Record a new reservation before any part is uploaded"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO reservations VALUES (?, ?, ?, ?, ?, ?)",
+                (screenshot_id, set_id, json.dumps(list(file_key)), checksum, json.dumps(operations), time.time())
+            )
+            self._db.commit()
+
+    def part_done(self, screenshot_id: str, offset: int):
+        """Record one successfully uploaded part"""
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO parts VALUES (?, ?)", (screenshot_id, offset))
+            self._db.commit()
+
+    def discard(self, screenshot_id: str):
+        """Forget a reservation (committed, or deleted remotely)"""
+        with self._lock:
+            self._db.execute("DELETE FROM reservations WHERE screenshot_id = ?", (screenshot_id,))
+            self._db.execute("DELETE FROM parts WHERE screenshot_id = ?", (screenshot_id,))
+            self._db.commit()
+
+    def expire(self):
+        """Delete reservations (and their parts) older than the lifetime"""
+        cutoff = time.time() - self.lifetime
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM parts WHERE screenshot_id IN "
+                "(SELECT screenshot_id FROM reservations WHERE reserved_at <= ?)", (cutoff,)
+            )
+            self._db.execute("DELETE FROM reservations WHERE reserved_at <= ?", (cutoff,))
+            self._db.commit()
+
+    def pending(self, set_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Unexpired reservations in a screenshot set, keyed by file path:
+        {"id", "file_key", "checksum", "operations", "parts_done"}
+        """
+        self.expire()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT screenshot_id, file_key, checksum, operations FROM reservations "
+                "WHERE set_id = ? ORDER BY reserved_at", (set_id,)
+            ).fetchall()
+            parts = {}
+            for screenshot_id, offset in self._db.execute(
+                "SELECT parts.screenshot_id, offset FROM parts JOIN reservations USING (screenshot_id) "
+                "WHERE set_id = ?", (set_id,)
+            ):
+                parts.setdefault(screenshot_id, set()).add(offset)
+
+        pending = {}
+        for screenshot_id, file_key, checksum, operations in rows:
+            file_key = tuple(json.loads(file_key))
+            pending[file_key[0]] = {
+                "id": screenshot_id,
+                "file_key": file_key,
+                "checksum": checksum,
+                "operations": json.loads(operations),
+                "parts_done": parts.get(screenshot_id, set())
+            }
+        return pending
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._db.execute("DELETE FROM reservations")
+            self._db.execute("DELETE FROM parts")
+            self._db.commit()
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+
+_journal: Optional[UploadJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_upload_journal() -> UploadJournal:
+    """Return the process-wide UploadJournal"""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = UploadJournal()
+        return _journal
@@ -0,0 +1,75 @@
+"""Per-locale Fan-out for metadata and screenshot uploads"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Callable
+from .api import AppStoreAPI
+from .config import LOCALE_CONCURRENCY
+
+
+def locale_dirs(root: str) -> Dict[str, str]:
+    """Locale folders under a root such as deployment/screenshots: {locale: path}"""
+    if not os.path.isdir(root):
+        return {}
+    with os.scandir(root) as entries:
+        return {
+            entry.name: entry.path
+            for entry in sorted(entries, key=lambda entry: entry.name)
+            if entry.is_dir() and not entry.name.startswith(".")
+        }
+
+
+def remote_locales(api: AppStoreAPI, endpoint: str, resource: str) -> Dict[str, str]:
+    """Every localization under a parent resource: {locale: localization_id}"""
+    return {
+        localization["attributes"]["locale"]: localization["id"]
+        for localization in api.iter(endpoint, fields={resource: "locale"})
+    }
+
+
+def match_locales(local: Dict[str, str], remote: Dict[str, str]) -> Tuple[Dict[str, Tuple[str, str]], List[str]]:
+    """
+    Pair local locale folders with remote localization ids
+
+    Returns:
+        matched: {locale: (folder, localization_id)}
+        unmatched: Local locales App Store Connect has no localization for
+    """
+    matched = {locale: (path, remote[locale]) for locale, path in local.items() if locale in remote}
+    unmatched = [locale for locale in local if locale not in remote]
+    return matched, unmatched
+
+
+def fan_out(jobs: Dict[str, Callable[[], bool]], concurrency: int = LOCALE_CONCURRENCY) -> Dict[str, bool]:
+    """
+    Run one job per locale through a bounded worker pool
+
+    Jobs share the caller's API client, so every request still goes through
+    the process-wide rate limiter. A job that raises counts as failed.
+
+    Returns:
+        {locale: success}
+    """
+    if not jobs:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(jobs)))) as executor:
+        futures = {locale: executor.submit(job) for locale, job in jobs.items()}
+
+    results = {}
+    for locale, future in futures.items():
+        try:
+            results[locale] = bool(future.result())
+        except Exception as e:
+            print(f"  ❌ {locale}: {e}")
+            results[locale] = False
+    return results
+
+
+def print_locale_report(title: str, results: Dict[str, bool], unmatched: List[str]):
+    """Per-locale summary of a fan-out"""
+    print(f"\n🌍 {title}:")
+    for locale, success in results.items():
+        print(f"  {'✅' if success else '❌'} {locale}")
+    for locale in unmatched:
+        print(f"  ⚠️  {locale}: no matching localization in App Store Connect (skipped)")
@@ -1,104 +1,185 @@
-"""Metadata Upload"""
+"""Metadata Index and Upload"""
 
+import os
+import threading
+from functools import partial
 from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 from .api import AppStoreAPI
+from .config import UPLOAD_CONCURRENCY
+from .locales import locale_dirs, remote_locales, match_locales, fan_out, print_locale_report
+
+# One folder per locale, named by its App Store Connect locale code
+METADATA_ROOT = "deployment/metadata"
+METADATA_DIR = "deployment/metadata/en-US"
+
+# Metadata file -> appInfoLocalizations attribute
+APP_INFO_FIELDS = {
+    "name.txt": "name",
+    "subtitle.txt": "subtitle",
+    "privacy_url.txt": "privacyPolicyUrl",
+}
+
+# Metadata file -> appStoreVersionLocalizations attribute
+# Note: whatsNew (release_notes.txt) cannot be set for initial version 1.0
+# It's only for updates, so we skip it
+VERSION_FIELDS = {
+    "description.txt": "description",
+    "keywords.txt": "keywords",
+    "promotional_text.txt": "promotionalText",
+    "support_url.txt": "supportUrl",
+    "marketing_url.txt": "marketingUrl",
+}
+
+
+# Localization resource -> the field table it is filled from
+METADATA_FIELDS = {
+    "appInfoLocalizations": APP_INFO_FIELDS,
+    "appStoreVersionLocalizations": VERSION_FIELDS,
+}
+# Metadata file -> (resource, attribute)
+FIELD_TABLE = {
+    filename: (resource, attribute)
+    for resource, fields in METADATA_FIELDS.items()
+    for filename, attribute in fields.items()
+}
+
+EMPTY = MappingProxyType({})
+
+
+class MetadataStore:
+    """
+    Read-only index of a metadata tree: {locale: {resource: {attribute: value}}}
+
+    The tree is scanned with os.scandir (one listing per locale folder) and only
+    files named in FIELD_TABLE are read. Each file is read again only when its
+    mtime or size changes; while nothing changes index() keeps returning the
+    same immutable mapping. Safe to share between threads.
+    """
+
+    def __init__(self, root: str = METADATA_ROOT):
+        self.root = root
+        self._lock = threading.Lock()
+        self._files: Dict[Tuple[str, str], Tuple[int, int, str]] = {}
+        self._index: Optional[Mapping[str, Mapping[str, Mapping[str, str]]]] = None
+
+    def _scan(self) -> Dict[Tuple[str, str], os.DirEntry]:
+        """Every field file in the tree, keyed by (locale, filename)"""
+        found = {}
+        for locale, folder in locale_dirs(self.root).items():
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name in FIELD_TABLE and entry.is_file():
+                        found[(locale, entry.name)] = entry
+        return found
+
+    def index(self) -> Mapping[str, Mapping[str, Mapping[str, str]]]:
+        """The current index, re-reading only files that changed since the last call"""
+        with self._lock:
+            found = self._scan()
+            changed = self._index is None or found.keys() != self._files.keys()
+            files = {}
+            for key, entry in found.items():
+                stat = entry.stat()
+                cached = self._files.get(key)
+                if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                    files[key] = cached
+                else:
+                    files[key] = (stat.st_mtime_ns, stat.st_size, Path(entry.path).read_text().strip())
+                    changed = True
+
+            if changed:
+                tree: Dict[str, Dict[str, Dict[str, str]]] = {}
+                for (locale, filename), (_, _, value) in sorted(files.items()):
+                    resource, attribute = FIELD_TABLE[filename]
+                    tree.setdefault(locale, {}).setdefault(resource, {})[attribute] = value
+                self._files = files
+                self._index = MappingProxyType({
+                    locale: MappingProxyType({resource: MappingProxyType(attributes)
+                                              for resource, attributes in resources.items()})
+                    for locale, resources in tree.items()
+                })
+            return self._index
+
+    def fields(self, locale: str, resource: str) -> Mapping[str, str]:
+        """Attributes one locale sets on one localization resource (empty if none)"""
+        return self.index().get(locale, EMPTY).get(resource, EMPTY)
+
+
+_stores: Dict[str, MetadataStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_metadata_store(root: str = METADATA_ROOT) -> MetadataStore:
+    """Return the process-wide MetadataStore for a metadata root"""
+    root = os.path.abspath(root)
+    with _stores_lock:
+        if root not in _stores:
+            _stores[root] = MetadataStore(root)
+        return _stores[root]
+
+
+def patch_locales(api: AppStoreAPI, resource: str, remote: Dict[str, str], metadata_root: str,
+                  title: str) -> bool:
+    """PATCH each local metadata/<locale>/ folder into its matching localization, locales in parallel"""
+    index = get_metadata_store(metadata_root).index()
+    matched, unmatched = match_locales(
+        {locale: resources[resource] for locale, resources in index.items() if resource in resources}, remote
+    )
+
+    def patch(locale: str, attributes: Mapping[str, str], localization_id: str) -> bool:
+        payload = {
+            "data": {
+                "type": resource,
+                "id": localization_id,
+                "attributes": dict(attributes)
+            }
+        }
+        result = api.patch(f"{resource}/{localization_id}", payload)
+        if "data" not in result:
+            print(f"  ❌ {locale}: {result.get('error')}")
+            return False
+        return True
 
+    results = fan_out({
+        locale: partial(patch, locale, attributes, localization_id)
+        for locale, (attributes, localization_id) in matched.items()
+    }, concurrency=UPLOAD_CONCURRENCY)
+    print_locale_report(title, results, unmatched)
+    return bool(results) and all(results.values())
 
-def upload_metadata(api: AppStoreAPI, app_id: str) -> bool:
+
+def upload_metadata(api: AppStoreAPI, app_id: str, metadata_root: str = METADATA_ROOT) -> bool:
     """
-    Upload app metadata (name, subtitle, description, etc.)
+    Upload app metadata (name, subtitle, privacy URL) for every locale folder
     """
     print(f"\n📝 Uploading metadata...")
 
-    # Get app info localization ID
-    result = api.get(f"apps/{app_id}/appInfos")
-    if not result.get("data"):
+    # Get app info
+    app_info = next(api.iter(f"apps/{app_id}/appInfos", limit=1), None)
+    if not app_info:
         print("❌ Could not find app info")
         return False
 
-    app_info_id = result["data"][0]["id"]
-
-    # Get localization
-    result = api.get(f"appInfos/{app_info_id}/appInfoLocalizations")
-    if not result.get("data"):
+    remote = remote_locales(api, f"appInfos/{app_info['id']}/appInfoLocalizations", "appInfoLocalizations")
+    if not remote:
         print("❌ Could not find localization")
         return False
 
-    localization_id = result["data"][0]["id"]
-
-    # Read metadata files
-    metadata_path = Path("deployment/metadata/en-US")
-
-    metadata = {}
-    if (metadata_path / "name.txt").exists():
-        metadata["name"] = (metadata_path / "name.txt").read_text().strip()
-    if (metadata_path / "subtitle.txt").exists():
-        metadata["subtitle"] = (metadata_path / "subtitle.txt").read_text().strip()
-    if (metadata_path / "privacy_url.txt").exists():
-        metadata["privacyPolicyUrl"] = (metadata_path / "privacy_url.txt").read_text().strip()
-
-    # Update app info localization
-    payload = {
-        "data": {
-            "type": "appInfoLocalizations",
-            "id": localization_id,
-            "attributes": metadata
-        }
-    }
-
-    result = api.patch(f"appInfoLocalizations/{localization_id}", payload)
-    if "data" in result:
-        print("✅ App info metadata uploaded")
-    else:
-        print(f"⚠️  App info upload failed: {result.get('error')}")
+    return patch_locales(api, "appInfoLocalizations", remote, metadata_root, "App info metadata")
 
-    return True
 
-
-def upload_version_metadata(api: AppStoreAPI, version_id: str) -> bool:
+def upload_version_metadata(api: AppStoreAPI, version_id: str, metadata_root: str = METADATA_ROOT) -> bool:
     """
-    Upload version-specific metadata (description, keywords, release notes)
+    Upload version-specific metadata (description, keywords, URLs) for every locale folder
     """
     print(f"\n📝 Uploading version metadata...")
 
-    # Get version localization
-    result = api.get(f"appStoreVersions/{version_id}/appStoreVersionLocalizations")
-    if not result.get("data"):
+    remote = remote_locales(api, f"appStoreVersions/{version_id}/appStoreVersionLocalizations",
+                            "appStoreVersionLocalizations")
+    if not remote:
         print("❌ Could not find version localization")
         return False
 
-    localization_id = result["data"][0]["id"]
-
-    # Read metadata files
-    metadata_path = Path("deployment/metadata/en-US")
-
-    metadata = {}
-    if (metadata_path / "description.txt").exists():
-        metadata["description"] = (metadata_path / "description.txt").read_text().strip()
-    if (metadata_path / "keywords.txt").exists():
-        metadata["keywords"] = (metadata_path / "keywords.txt").read_text().strip()
-    # Note: whatsNew (release notes) cannot be set for initial version 1.0
-    # It's only for updates, so we skip it
-    if (metadata_path / "promotional_text.txt").exists():
-        metadata["promotionalText"] = (metadata_path / "promotional_text.txt").read_text().strip()
-    if (metadata_path / "support_url.txt").exists():
-        metadata["supportUrl"] = (metadata_path / "support_url.txt").read_text().strip()
-    if (metadata_path / "marketing_url.txt").exists():
-        metadata["marketingUrl"] = (metadata_path / "marketing_url.txt").read_text().strip()
-
-    # Update version localization
-    payload = {
-        "data": {
-            "type": "appStoreVersionLocalizations",
-            "id": localization_id,
-            "attributes": metadata
-        }
-    }
-
-    result = api.patch(f"appStoreVersionLocalizations/{localization_id}", payload)
-    if "data" in result:
-        print("✅ Version metadata uploaded")
-        return True
-    else:
-        print(f"❌ Version metadata upload failed: {result.get('error')}")
-        return False
+    return patch_locales(api, "appStoreVersionLocalizations", remote, metadata_root, "Version metadata")
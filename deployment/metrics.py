@@ -0,0 +1,164 @@
+"""Per-request Metrics for App Store Connect API and Upload Calls"""
+
+import json
+import math
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Optional, Dict, List, Any, Tuple
+from .config import METRICS_DIR
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Collapse resource ids so requests group by endpoint,
+    e.g. '/v1/apps/123/appInfos?limit=1' -> 'apps/{id}/appInfos'.
+    Asset upload URLs group by host.
+    """
+    parts = urlsplit(url)
+    segments = [s for s in parts.path.split("/") if s]
+    if not segments or segments[0] != "v1":
+        return f"upload:{parts.netloc}"
+
+    template = []
+    expect_type = True
+    for segment in segments[1:]:
+        if segment == "relationships":
+            template.append(segment)
+            continue
+        template.append(segment if expect_type else "{id}")
+        expect_type = not expect_type
+    return "/".join(template)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class RequestMetrics:
+    """Thread-safe record of every request a client sends"""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, method: str, url: str, status: Optional[int], latency: float,
+               bytes_sent: int = 0, bytes_received: int = 0, retries: int = 0,
+               rate_limit_remaining: Optional[int] = None):
+        """Record one request (after any retries)"""
+        entry = {
+            "method": method,
+            "endpoint": endpoint_template(url),
+            "status": status,
+            "latency": latency,
+            "bytes_sent": bytes_sent,
+            "bytes_received": bytes_received,
+            "retries": retries,
+            "rate_limit_remaining": rate_limit_remaining
+        }
+        with self._lock:
+            self.records.append(entry)
+
+    def summary(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Aggregate per (method, endpoint) with latency percentiles"""
+        with self._lock:
+            records = list(self.records)
+
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for entry in records:
+            groups.setdefault((entry["method"], entry["endpoint"]), []).append(entry)
+
+        summary = {}
+        for key, entries in sorted(groups.items()):
+            latencies = [e["latency"] for e in entries]
+            summary[key] = {
+                "count": len(entries),
+                "errors": sum(1 for e in entries if not e["status"] or e["status"] >= 400),
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "total_latency": sum(latencies),
+                "bytes_sent": sum(e["bytes_sent"] for e in entries),
+                "bytes_received": sum(e["bytes_received"] for e in entries),
+                "retries": sum(e["retries"] for e in entries)
+            }
+        return summary
+
+    def rate_limit_remaining(self) -> Optional[int]:
+        """Most recent quota headroom reported by the server"""
+        with self._lock:
+            for entry in reversed(self.records):
+                if entry["rate_limit_remaining"] is not None:
+                    return entry["rate_limit_remaining"]
+        return None
+
+    def to_ndjson(self) -> str:
+        """One JSON object per request"""
+        with self._lock:
+            return "".join(json.dumps(entry) + "\n" for entry in self.records)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition of the summary"""
+        summary = self.summary()
+        counters = (
+            ("slidecast_api_requests_total", "count"),
+            ("slidecast_api_errors_total", "errors"),
+            ("slidecast_api_retries_total", "retries"),
+            ("slidecast_api_bytes_sent_total", "bytes_sent"),
+            ("slidecast_api_bytes_received_total", "bytes_received"),
+        )
+
+        # Samples of one metric family must be grouped together
+        lines = []
+        for metric, key in counters:
+            lines.append(f"# TYPE {metric} counter")
+            for (method, endpoint), stats in summary.items():
+                lines.append(f'{metric}{{method="{method}",endpoint="{endpoint}"}} {stats[key]}')
+
+        lines.append("# TYPE slidecast_api_request_duration_seconds summary")
+        for (method, endpoint), stats in summary.items():
+            labels = f'method="{method}",endpoint="{endpoint}"'
+            for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                lines.append(
+                    f'slidecast_api_request_duration_seconds{{{labels},quantile="{quantile}"}} {stats[key]:.6f}'
+                )
+            lines.append(f"slidecast_api_request_duration_seconds_sum{{{labels}}} {stats['total_latency']:.6f}")
+            lines.append(f"slidecast_api_request_duration_seconds_count{{{labels}}} {stats['count']}")
+
+        remaining = self.rate_limit_remaining()
+        if remaining is not None:
+            lines.append("# TYPE slidecast_api_rate_limit_remaining gauge")
+            lines.append(f"slidecast_api_rate_limit_remaining {remaining}")
+
+        return "\n".join(lines) + "\n"
+
+    def print_summary(self):
+        """Print a per-endpoint table"""
+        summary = self.summary()
+        if not summary:
+            return
+
+        print(f"\n📊 {sum(s['count'] for s in summary.values())} requests")
+        for (method, endpoint), stats in summary.items():
+            print(f"   {method:6} {endpoint:60} n={stats['count']:<4} "
+                  f"p50={stats['p50'] * 1000:.0f}ms p95={stats['p95'] * 1000:.0f}ms "
+                  f"retries={stats['retries']} errors={stats['errors']}")
+
+        remaining = self.rate_limit_remaining()
+        if remaining is not None:
+            print(f"   Rate limit remaining: {remaining}")
+
+    def export(self, name: str, directory: str = METRICS_DIR):
+        """Write <name>.ndjson and <name>.prom and print the summary"""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / f"{name}.ndjson").write_text(self.to_ndjson())
+        (path / f"{name}.prom").write_text(self.to_prometheus())
+
+        self.print_summary()
+        print(f"   Metrics written to {path / name}.{{ndjson,prom}}")
@@ -0,0 +1,445 @@
+"""Local App Store Connect Stand-in Server for Offline Runs and Benchmarks"""
+
+import json
+import time
+import random
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, parse_qsl, urlencode
+from typing import Optional, Dict, List, Any, Tuple
+
+# child type -> (relationship on child, parent type, to-many relationship on parent)
+PARENTS = {
+    "appInfos": ("app", "apps", "appInfos"),
+    "appInfoLocalizations": ("appInfo", "appInfos", "appInfoLocalizations"),
+    "appStoreVersions": ("app", "apps", "appStoreVersions"),
+    "appStoreVersionLocalizations": ("appStoreVersion", "appStoreVersions", "appStoreVersionLocalizations"),
+    "appScreenshotSets": ("appStoreVersionLocalization", "appStoreVersionLocalizations", "appScreenshotSets"),
+    "appScreenshots": ("appScreenshotSet", "appScreenshotSets", "appScreenshots"),
+    "builds": ("app", "apps", "builds"),
+    "appStoreReviewSubmissions": ("appStoreVersion", "appStoreVersions", "appStoreReviewSubmissions"),
+}
+
+# Size of each uploadOperations part handed out for new assets
+PART_SIZE = 4 * 1024 * 1024
+MAX_PAGE_SIZE = 200
+
+
+def api_error(status: int, code: str, detail: str) -> Tuple[int, Dict]:
+    """JSON:API error document"""
+    return status, {"errors": [{"status": str(status), "code": code, "detail": detail}]}
+
+
+class MockAppStore:
+    """
+    In-memory App Store Connect state
+
+    Resources are stored JSON:API style; parent/child links are kept as
+    ordered id lists so relationship endpoints return a stable order.
+    """
+
+    def __init__(self, part_size: int = PART_SIZE, processing_time: float = 0.0):
+        self.part_size = part_size
+        self.processing_time = processing_time
+        self.base_url = ""
+        self.resources: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.children: Dict[Tuple[str, str, str], List[str]] = {}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self._next_id = 0
+        self._lock = threading.RLock()
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return f"{self._next_id:08d}"
+
+    def create(self, resource_type: str, attributes: Dict[str, Any],
+               relationships: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Add a resource and link it to its parent"""
+        with self._lock:
+            resource = {
+                "type": resource_type,
+                "id": self._new_id(),
+                "attributes": dict(attributes),
+                "relationships": {}
+            }
+            for name, value in (relationships or {}).items():
+                resource["relationships"][name] = {"data": value.get("data")}
+
+            self.resources.setdefault(resource_type, {})[resource["id"]] = resource
+
+            parent = self.parent_of(resource)
+            if parent:
+                self.children.setdefault(parent, []).append(resource["id"])
+            return resource
+
+    def parent_of(self, resource: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+        """(parent type, parent id, relationship) a resource hangs off, if any"""
+        link = PARENTS.get(resource["type"])
+        if not link:
+            return None
+        data = resource["relationships"].get(link[0], {}).get("data")
+        if not data:
+            return None
+        return link[1], data["id"], link[2]
+
+    def delete(self, resource_type: str, resource_id: str) -> bool:
+        """Remove a resource (and unlink it from its parent)"""
+        with self._lock:
+            resource = self.resources.get(resource_type, {}).pop(resource_id, None)
+            if resource is None:
+                return False
+            parent = self.parent_of(resource)
+            if parent and resource_id in self.children.get(parent, []):
+                self.children[parent].remove(resource_id)
+            return True
+
+    def seed(self, bundle_id: str, locales: List[str], version: str = "1.0") -> Dict[str, Any]:
+        """Create an app with one localization per locale and a version ready for metadata"""
+        self.create("bundleIds", {"identifier": bundle_id, "name": bundle_id, "platform": "IOS"})
+        app = self.create("apps", {"bundleId": bundle_id, "name": bundle_id, "sku": bundle_id})
+        app_ref = {"data": {"type": "apps", "id": app["id"]}}
+
+        app_info = self.create("appInfos", {"state": "PREPARE_FOR_SUBMISSION"}, {"app": app_ref})
+        version_resource = self.create(
+            "appStoreVersions",
+            {"versionString": version, "platform": "IOS", "appStoreState": "PREPARE_FOR_SUBMISSION"},
+            {"app": app_ref}
+        )
+        for locale in locales:
+            self.create("appInfoLocalizations", {"locale": locale},
+                        {"appInfo": {"data": {"type": "appInfos", "id": app_info["id"]}}})
+            self.create("appStoreVersionLocalizations", {"locale": locale},
+                        {"appStoreVersion": {"data": {"type": "appStoreVersions", "id": version_resource["id"]}}})
+
+        self.create("builds", {"version": "1", "uploadedDate": "2025-01-01T00:00:00Z",
+                               "processingState": "VALID"}, {"app": app_ref})
+        return {"app_id": app["id"], "version_id": version_resource["id"]}
+
+    def render(self, resource: Dict[str, Any], fields: Dict[str, List[str]],
+               include: List[str]) -> Dict[str, Any]:
+        """Resource document with sparse fieldsets and included relationships"""
+        processing = resource.get("processing")
+        if processing and time.monotonic() >= processing[0]:
+            resource["attributes"]["assetDeliveryState"] = processing[1]
+            del resource["processing"]
+
+        wanted = fields.get(resource["type"])
+        attributes = resource["attributes"]
+        if wanted:
+            attributes = {k: v for k, v in attributes.items() if k in wanted}
+
+        rendered = {
+            "type": resource["type"],
+            "id": resource["id"],
+            "attributes": attributes,
+            "relationships": dict(resource["relationships"])
+        }
+        for relationship in include:
+            ids = self.children.get((resource["type"], resource["id"], relationship), [])
+            rendered["relationships"][relationship] = {"data": [{"type": relationship, "id": i} for i in ids]}
+        return rendered
+
+    def handle(self, method: str, url: str, body: Optional[Dict]) -> Tuple[int, Optional[Dict]]:
+        """Dispatch one API request, returning (status, JSON body)"""
+        parts = urlsplit(url)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        segments = [s for s in parts.path.split("/") if s][1:]  # Drop "v1"
+
+        with self._lock:
+            if method == "GET":
+                return self._get(segments, query, url)
+            if method == "POST" and len(segments) == 1:
+                return self._post(segments[0], body or {})
+            if method == "PATCH" and len(segments) == 2:
+                return self._patch(segments[0], segments[1], body or {})
+            if method == "PATCH" and len(segments) == 4 and segments[2] == "relationships":
+                return self._replace_relationship(segments[0], segments[1], segments[3], body or {})
+            if method == "DELETE" and len(segments) == 2:
+                if self.delete(segments[0], segments[1]):
+                    return 204, None
+                return api_error(404, "NOT_FOUND", f"{segments[0]} {segments[1]} not found")
+
+        return api_error(405, "METHOD_NOT_ALLOWED", f"{method} {parts.path} is not supported")
+
+    def _get(self, segments: List[str], query: Dict[str, str], url: str) -> Tuple[int, Dict]:
+        fields = {k[7:-1]: v.split(",") for k, v in query.items() if k.startswith("fields[")}
+        include = [name for name in query.get("include", "").split(",") if name]
+
+        if len(segments) == 2:
+            resource = self.resources.get(segments[0], {}).get(segments[1])
+            if resource is None:
+                return api_error(404, "NOT_FOUND", f"{segments[0]} {segments[1]} not found")
+            return 200, {"data": self.render(resource, fields, include)}
+
+        if len(segments) == 1:
+            items = list(self.resources.get(segments[0], {}).values())
+        elif len(segments) == 3:
+            ids = self.children.get((segments[0], segments[1], segments[2]), [])
+            items = [self.resources[segments[2]][i] for i in ids]
+        else:
+            return api_error(404, "NOT_FOUND", "Unknown endpoint")
+
+        # filter[attribute]=a,b or filter[relationship]=id
+        for key, value in query.items():
+            if not key.startswith("filter["):
+                continue
+            name, allowed = key[7:-1], value.split(",")
+            items = [
+                item for item in items
+                if str(item["attributes"].get(name)) in allowed
+                or (item["relationships"].get(name, {}).get("data") or {}).get("id") in allowed
+            ]
+
+        if "sort" in query:
+            key = query["sort"].lstrip("-")
+            items.sort(key=lambda item: str(item["attributes"].get(key, "")), reverse=query["sort"].startswith("-"))
+
+        limit = min(int(query.get("limit", 50)), MAX_PAGE_SIZE)
+        cursor = int(query.get("cursor", 0))
+        page = items[cursor:cursor + limit]
+
+        document = {"data": [self.render(item, fields, include) for item in page], "links": {"self": url}}
+        if cursor + limit < len(items):
+            parts = urlsplit(url)
+            params = [(k, v) for k, v in parse_qsl(parts.query) if k != "cursor"] + [("cursor", cursor + limit)]
+            document["links"]["next"] = f"{parts.scheme}://{parts.netloc}{parts.path}?{urlencode(params, safe='[],')}"
+
+        if include:
+            included_limit = {k[6:-1]: int(v) for k, v in query.items() if k.startswith("limit[")}
+            document["included"] = []
+            for item in page:
+                for relationship in include:
+                    ids = self.children.get((item["type"], item["id"], relationship), [])
+                    for child_id in ids[:included_limit.get(relationship, 50)]:
+                        child = self.resources[relationship][child_id]
+                        document["included"].append(self.render(child, fields, []))
+
+        return 200, document
+
+    def _post(self, resource_type: str, body: Dict) -> Tuple[int, Dict]:
+        data = body.get("data", {})
+        attributes = data.get("attributes", {})
+        relationships = data.get("relationships", {})
+
+        if resource_type == "appStoreVersions":
+            app_id = relationships.get("app", {}).get("data", {}).get("id")
+            for existing in self.resources.get("appStoreVersions", {}).values():
+                same_app = existing["relationships"]["app"]["data"]["id"] == app_id
+                if same_app and existing["attributes"]["versionString"] == attributes.get("versionString"):
+                    return api_error(409, "ENTITY_ALREADY_EXISTS", "A version with this number already exists")
+            attributes = {**attributes, "appStoreState": "PREPARE_FOR_SUBMISSION"}
+
+        resource = self.create(resource_type, attributes, relationships)
+
+        if resource_type == "appStoreVersions":
+            # New versions inherit the locales of the app's other versions
+            locales = sorted({loc["attributes"]["locale"]
+                              for loc in self.resources.get("appStoreVersionLocalizations", {}).values()})
+            for locale in locales or ["en-US"]:
+                self.create("appStoreVersionLocalizations", {"locale": locale},
+                            {"appStoreVersion": {"data": {"type": "appStoreVersions", "id": resource["id"]}}})
+
+        if resource_type == "appScreenshots":
+            size = int(attributes.get("fileSize", 0))
+            operations = []
+            for index, offset in enumerate(range(0, max(size, 1), self.part_size)):
+                operations.append({
+                    "method": "PUT",
+                    "url": f"{self.base_url}/upload/{resource['id']}/{index}",
+                    "offset": offset,
+                    "length": min(self.part_size, size - offset),
+                    "requestHeaders": [{"name": "Content-Type", "value": "image/png"}]
+                })
+            resource["attributes"].update({
+                "uploadOperations": operations,
+                "assetDeliveryState": {"state": "AWAITING_UPLOAD", "errors": []},
+                "sourceFileChecksum": None
+            })
+            self.uploads[resource["id"]] = {}
+
+        return 201, {"data": self.render(resource, {}, [])}
+
+    def _patch(self, resource_type: str, resource_id: str, body: Dict) -> Tuple[int, Dict]:
+        resource = self.resources.get(resource_type, {}).get(resource_id)
+        if resource is None:
+            return api_error(404, "NOT_FOUND", f"{resource_type} {resource_id} not found")
+
+        data = body.get("data", {})
+        resource["attributes"].update(data.get("attributes", {}))
+        for name, value in data.get("relationships", {}).items():
+            resource["relationships"][name] = {"data": value.get("data")}
+
+        if resource_type == "appScreenshots" and data.get("attributes", {}).get("uploaded"):
+            parts = self.uploads.get(resource_id, {})
+            content = b"".join(parts[i] for i in sorted(parts))
+            valid = hashlib.md5(content).hexdigest() == resource["attributes"].get("sourceFileChecksum")
+            delivery = {
+                "state": "COMPLETE" if valid else "FAILED",
+                "errors": [] if valid else [{"code": "CHECKSUM_MISMATCH", "description": "Checksum mismatch"}]
+            }
+            resource["attributes"].pop("uploadOperations", None)
+            if self.processing_time > 0:
+                # Reported as UPLOAD_COMPLETE until processing "finishes" (see render)
+                resource["attributes"]["assetDeliveryState"] = {"state": "UPLOAD_COMPLETE", "errors": []}
+                resource["processing"] = (time.monotonic() + self.processing_time, delivery)
+            else:
+                resource["attributes"]["assetDeliveryState"] = delivery
+
+        return 200, {"data": self.render(resource, {}, [])}
+
+    def _replace_relationship(self, resource_type: str, resource_id: str, relationship: str,
+                              body: Dict) -> Tuple[int, Optional[Dict]]:
+        key = (resource_type, resource_id, relationship)
+        ids = [item["id"] for item in body.get("data", [])]
+        if sorted(ids) != sorted(self.children.get(key, [])):
+            return api_error(409, "ENTITY_ERROR", "Relationship must list every existing member")
+        self.children[key] = ids
+        return 204, None
+
+    def upload(self, resource_id: str, part: int, content: bytes) -> int:
+        """Store one uploaded asset part"""
+        with self._lock:
+            if resource_id not in self.uploads:
+                return 404
+            self.uploads[resource_id][part] = content
+            return 200
+
+
+class MockAppStoreServer:
+    """
+    HTTP server answering App Store Connect requests from a MockAppStore
+
+    Args:
+        latency: Seconds added to every request
+        hourly_limit: Requests allowed before answering 429 (reported via X-Rate-Limit)
+        error_rate: Fraction of API requests answered with a 503
+        seed: Random seed for error injection
+        processing_time: Seconds a committed screenshot stays UPLOAD_COMPLETE before its final state
+    """
+
+    def __init__(self, latency: float = 0.0, hourly_limit: int = 3600, error_rate: float = 0.0,
+                 seed: int = 0, part_size: int = PART_SIZE, processing_time: float = 0.0):
+        self.latency = latency
+        self.hourly_limit = hourly_limit
+        self.error_rate = error_rate
+        self.store = MockAppStore(part_size=part_size, processing_time=processing_time)
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self.store.base_url = self.url
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    @property
+    def base_url(self) -> str:
+        """Use as AppStoreAPI(base_url=...)"""
+        return f"{self.url}/v1"
+
+    def start(self) -> "MockAppStoreServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockAppStoreServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _admit(self) -> Tuple[Optional[int], int]:
+        """Count a request; returns (injected status or None, remaining quota)"""
+        with self._lock:
+            self.request_count += 1
+            remaining = max(self.hourly_limit - self.request_count, 0)
+            if self.request_count > self.hourly_limit:
+                return 429, remaining
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 503, remaining
+            return None, remaining
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; avoid delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None):
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if payload:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                path = urlsplit(self.path).path
+                if path.startswith("/upload/"):
+                    _, _, resource_id, part = path.split("/")
+                    self._reply(server.store.upload(resource_id, int(part), raw))
+                    return
+
+                injected, remaining = server._admit()
+                headers = {"X-Rate-Limit": f"user-hour-lim:{server.hourly_limit};user-hour-rem:{remaining};"}
+                if injected == 429:
+                    self._reply(*api_error(429, "RATE_LIMIT_EXCEEDED", "Rate limit exceeded"),
+                                headers={**headers, "Retry-After": "1"})
+                    return
+                if injected:
+                    self._reply(*api_error(injected, "SERVICE_UNAVAILABLE", "Injected failure"), headers=headers)
+                    return
+
+                body = json.loads(raw) if raw else None
+                status, document = server.store.handle(self.command, server.url + self.path, body)
+
+                if self.command == "GET" and status == 200:
+                    etag = '"' + hashlib.md5(json.dumps(document, sort_keys=True).encode()).hexdigest() + '"'
+                    headers["ETag"] = etag
+                    if self.headers.get("If-None-Match") == etag:
+                        self._reply(304, headers=headers)
+                        return
+
+                self._reply(status, document, headers)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import sys
+    import os
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from deployment.config import BUNDLE_ID
+
+    mock = MockAppStoreServer(latency=float(sys.argv[1]) if len(sys.argv) > 1 else 0.0)
+    mock.store.seed(BUNDLE_ID, ["en-US"])
+    print(f"🧪 Mock App Store Connect listening on {mock.base_url} (Ctrl-C to stop)")
+    try:
+        mock.start()._thread.join()
+    except KeyboardInterrupt:
+        mock.stop()
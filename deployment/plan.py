@@ -0,0 +1,304 @@
+"""Plan/Apply: diff local store state against App Store Connect and send only the changes"""
+
+import os
+import json
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Callable
+from .api import AppStoreAPI, APIError
+from .bundle import get_app_id
+from .locales import match_locales
+from .metadata import METADATA_DIR, APP_INFO_FIELDS, VERSION_FIELDS, get_metadata_store
+from .screenshots import (
+    prepare_screenshots, load_screenshot_sets, diff_screenshots, order_changed,
+    screenshot_set_payload, reorder_payload, upload_single_screenshot, resumable_screenshots, resume_screenshot
+)
+
+SCREENSHOTS_DIR = "deployment/screenshots/en-US"
+# Rough request body size of a reserve + commit pair, for byte estimates
+UPLOAD_OVERHEAD_BYTES = 600
+
+
+class Change:
+    """One mutation in a plan: what it does, what it costs, and how to run it"""
+
+    def __init__(self, symbol: str, description: str, calls: int, bytes_sent: int,
+                 run: Callable[[AppStoreAPI, Dict[str, Any]], bool]):
+        self.symbol = symbol
+        self.description = description
+        self.calls = calls
+        self.bytes_sent = bytes_sent
+        self.run = run
+
+
+class Plan:
+    """Ordered changes plus the ids they share while applying"""
+
+    def __init__(self):
+        self.changes: List[Change] = []
+        # Screenshot set ids by display type, uploaded screenshot ids by file
+        self.context: Dict[str, Dict[str, str]] = {"sets": {}, "uploaded": {}}
+
+    @property
+    def calls(self) -> int:
+        return sum(change.calls for change in self.changes)
+
+    @property
+    def bytes_sent(self) -> int:
+        return sum(change.bytes_sent for change in self.changes)
+
+    def print(self):
+        """Print the changes and what applying them would cost"""
+        print("\n" + "=" * 60)
+        print("📋 Plan")
+        print("=" * 60)
+
+        if not self.changes:
+            print("\n✅ Nothing to do - App Store Connect matches local state")
+            return
+
+        print()
+        for change in self.changes:
+            print(f"  {change.symbol} {change.description}")
+        print(f"\n{len(self.changes)} changes, ~{self.calls} API calls, {self.bytes_sent:,} bytes to send")
+
+    def apply(self, api: AppStoreAPI) -> bool:
+        """Run every change in order"""
+        print(f"\n🚀 Applying {len(self.changes)} changes...")
+        success = True
+        for change in self.changes:
+            if not change.run(api, self.context):
+                print(f"  ❌ {change.description}")
+                success = False
+        return success
+
+
+def load_desired_state(metadata_dir: str = METADATA_DIR, screenshots_dir: str = SCREENSHOTS_DIR,
+                       version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Read the local metadata files and screenshots (None if a screenshot is invalid)"""
+    metadata_path = Path(metadata_dir)
+    store = get_metadata_store(str(metadata_path.parent))
+    screenshots_path = Path(screenshots_dir)
+
+    screenshots = {}
+    if screenshots_path.exists():
+        screenshots = prepare_screenshots(screenshots_path)
+        if screenshots is None:
+            return None
+
+    return {
+        "version": version,
+        "app_info": dict(store.fields(metadata_path.name, "appInfoLocalizations")),
+        "version_localization": dict(store.fields(metadata_path.name, "appStoreVersionLocalizations")),
+        "screenshots": screenshots
+    }
+
+
+def find_localization(api: AppStoreAPI, endpoint: str, resource: str, fields: List[str],
+                      locale: str) -> Optional[Dict[str, Any]]:
+    """The localization for one locale among all under a parent (None, listing the others, if absent)"""
+    localizations = {
+        localization["attributes"]["locale"]: localization
+        for localization in api.iter(endpoint, fields={resource: ["locale", *fields]})
+    }
+    matched, unmatched = match_locales({locale: locale}, localizations)
+    if unmatched:
+        print(f"❌ No {locale} {resource} on App Store Connect "
+              f"(found: {', '.join(sorted(localizations)) or 'none'})")
+        return None
+    return matched[locale][1]
+
+
+def fetch_remote_state(api: AppStoreAPI, locale: str) -> Optional[Dict[str, Any]]:
+    """Fetch everything the plan compares against for one locale in a handful of GETs"""
+    app_id = get_app_id(api)
+    if not app_id:
+        return None
+
+    app_info = next(api.iter(f"apps/{app_id}/appInfos", limit=1), None)
+    app_info_localization = None
+    if app_info:
+        app_info_localization = find_localization(
+            api, f"appInfos/{app_info['id']}/appInfoLocalizations", "appInfoLocalizations",
+            list(APP_INFO_FIELDS.values()), locale)
+        if app_info_localization is None:
+            return None
+
+    version = next(api.iter(
+        f"apps/{app_id}/appStoreVersions?filter[appStoreState]=PREPARE_FOR_SUBMISSION&filter[platform]=IOS",
+        fields={"appStoreVersions": "versionString"}, limit=1), None)
+
+    version_localization = None
+    screenshot_sets = {}
+    if version:
+        version_localization = find_localization(
+            api, f"appStoreVersions/{version['id']}/appStoreVersionLocalizations", "appStoreVersionLocalizations",
+            list(VERSION_FIELDS.values()), locale)
+        if version_localization is None:
+            return None
+        screenshot_sets = load_screenshot_sets(api, version_localization["id"])
+        if screenshot_sets is None:
+            return None
+
+    return {
+        "app_id": app_id,
+        "app_info_localization": app_info_localization,
+        "version": version,
+        "version_localization": version_localization,
+        "screenshot_sets": screenshot_sets
+    }
+
+
+def patch_change(resource_type: str, resource: Dict[str, Any], desired: Dict[str, str]) -> Optional[Change]:
+    """PATCH only the attributes whose remote value differs"""
+    current = resource.get("attributes", {})
+    attributes = {name: value for name, value in desired.items() if (current.get(name) or "") != value}
+    if not attributes:
+        return None
+
+    endpoint = f"{resource_type}/{resource['id']}"
+    payload = {"data": {"type": resource_type, "id": resource["id"], "attributes": attributes}}
+
+    def run(api: AppStoreAPI, context: Dict[str, Any]) -> bool:
+        result = api.patch(endpoint, payload)
+        if "data" not in result:
+            print(f"    ❌ {result.get('error')}")
+        return "data" in result
+
+    return Change("~", f"PATCH {endpoint} ({', '.join(attributes)})", 1, len(json.dumps(payload)), run)
+
+
+def screenshot_changes(display_type: str, files: List[str], screenshot_set: Optional[Dict],
+                       localization_id: str) -> List[Change]:
+    """Changes that bring one screenshot set in line with the local files"""
+    changes = []
+
+    if screenshot_set is None:
+        payload = screenshot_set_payload(localization_id, display_type)
+
+        def create_set(api: AppStoreAPI, context: Dict[str, Any]) -> bool:
+            result = api.post("appScreenshotSets", payload)
+            if "data" not in result:
+                print(f"    ❌ {result.get('error')}")
+                return False
+            context["sets"][display_type] = result["data"]["id"]
+            return True
+
+        changes.append(Change("+", f"create {display_type} screenshot set", 1, len(json.dumps(payload)), create_set))
+        remote, keep, delete, upload, resume = [], {}, [], list(files), {}
+    else:
+        # Reservations an interrupted run left behind are finished, not redone
+        resume = resumable_screenshots(screenshot_set, files)
+        resumed_ids = {entry["id"] for entry in resume.values()}
+        remote = [screenshot for screenshot in screenshot_set["screenshots"] if screenshot["id"] not in resumed_ids]
+        keep, delete, upload = diff_screenshots(remote, [file_path for file_path in files if file_path not in resume])
+
+    for screenshot_id in delete:
+        def delete_screenshot(api: AppStoreAPI, context: Dict[str, Any], screenshot_id=screenshot_id) -> bool:
+            return api.delete(f"appScreenshots/{screenshot_id}")
+
+        changes.append(Change("-", f"delete appScreenshots/{screenshot_id} ({display_type})", 1, 0,
+                              delete_screenshot))
+
+    for file_path in upload:
+        def upload_screenshot(api: AppStoreAPI, context: Dict[str, Any], file_path=file_path) -> bool:
+            screenshot_set_id = context["sets"].get(display_type)
+            if not screenshot_set_id:
+                return False
+            screenshot_id = upload_single_screenshot(api, screenshot_set_id, file_path)
+            if screenshot_id:
+                context["uploaded"][file_path] = screenshot_id
+            return bool(screenshot_id)
+
+        size = os.path.getsize(file_path)
+        changes.append(Change("+", f"upload {Path(file_path).name} ({size:,} bytes)", 3,
+                              size + UPLOAD_OVERHEAD_BYTES, upload_screenshot))
+
+    for file_path, entry in resume.items():
+        def resume_upload(api: AppStoreAPI, context: Dict[str, Any], file_path=file_path, entry=entry) -> bool:
+            screenshot_id = resume_screenshot(api, context["sets"][display_type], file_path, entry)
+            if screenshot_id:
+                context["uploaded"][file_path] = screenshot_id
+            return bool(screenshot_id)
+
+        remaining = [operation for operation in entry["operations"] if operation["offset"] not in entry["parts_done"]]
+        changes.append(Change("~", f"resume {Path(file_path).name} ({len(remaining)} parts left)", len(remaining) + 1,
+                              sum(operation["length"] for operation in remaining) + UPLOAD_OVERHEAD_BYTES,
+                              resume_upload))
+
+    # Uploads run one after another here, so they are appended in file order;
+    # resumed reservations sit wherever they were reserved
+    if resume or order_changed(remote, keep, upload, files):
+        def reorder(api: AppStoreAPI, context: Dict[str, Any]) -> bool:
+            ids = [keep.get(file_path) or context["uploaded"].get(file_path) for file_path in files]
+            if not all(ids):
+                return False
+            result = api.patch(f"appScreenshotSets/{context['sets'][display_type]}/relationships/appScreenshots",
+                               reorder_payload(ids))
+            return "error" not in result
+
+        changes.append(Change("~", f"reorder {display_type} screenshots", 1,
+                              len(json.dumps(reorder_payload(["0" * 36] * len(files)))), reorder))
+
+    return changes
+
+
+def compute_plan(desired: Dict[str, Any], remote: Dict[str, Any]) -> Plan:
+    """Minimal changeset that turns the remote state into the desired one"""
+    plan = Plan()
+
+    if remote["app_info_localization"]:
+        change = patch_change("appInfoLocalizations", remote["app_info_localization"], desired["app_info"])
+        if change:
+            plan.changes.append(change)
+
+    version = remote["version"]
+    if version and desired["version"]:
+        change = patch_change("appStoreVersions", version, {"versionString": desired["version"]})
+        if change:
+            plan.changes.append(change)
+
+    localization = remote["version_localization"]
+    if localization:
+        change = patch_change("appStoreVersionLocalizations", localization, desired["version_localization"])
+        if change:
+            plan.changes.append(change)
+
+        for display_type, screenshot_set in remote["screenshot_sets"].items():
+            plan.context["sets"][display_type] = screenshot_set["id"]
+
+        for display_type, files in desired["screenshots"].items():
+            plan.changes += screenshot_changes(
+                display_type, files, remote["screenshot_sets"].get(display_type), localization["id"]
+            )
+
+    return plan
+
+
+def build_plan(api: AppStoreAPI, metadata_dir: str = METADATA_DIR, screenshots_dir: str = SCREENSHOTS_DIR,
+               version: Optional[str] = None) -> Optional[Plan]:
+    """
+    Load local state, fetch remote state and diff them
+
+    A plan covers a single locale: the name of the metadata folder (e.g.
+    en-US). The screenshots folder must be for the same locale.
+    """
+    locale = Path(metadata_dir).name
+    if Path(screenshots_dir).name != locale:
+        print(f"❌ Screenshots folder {screenshots_dir} is not for the metadata locale {locale}")
+        return None
+
+    desired = load_desired_state(metadata_dir, screenshots_dir, version)
+    if desired is None:
+        return None
+    try:
+        remote = fetch_remote_state(api, locale)
+    except APIError as e:
+        print(f"❌ Could not read App Store Connect state: {e}")
+        return None
+    if remote is None:
+        return None
+
+    if not remote["version"]:
+        print("⚠️  No version in PREPARE_FOR_SUBMISSION state - only app info will be planned")
+
+    return compute_plan(desired, remote)
@@ -0,0 +1,145 @@
+"""Client-side Rate Limiting and Retry Policy"""
+
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Mapping
+
+# App Store Connect allows this many requests per rolling hour
+HOURLY_LIMIT = 3600
+WINDOW = 3600
+# Requests allowed back to back before pacing kicks in
+BURST = 20
+# Pacing rate while plenty of quota is left (requests per second)
+MAX_RATE = 20.0
+# Below this fraction of the hourly quota everyone slows down
+LOW_WATER = 0.2
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+
+def parse_rate_limit(value: str) -> Dict[str, int]:
+    """Parse an X-Rate-Limit header like 'user-hour-lim:3600;user-hour-rem:3599;'"""
+    parsed = {}
+    for part in value.split(";"):
+        name, _, number = part.strip().partition(":")
+        if name and number.strip().isdigit():
+            parsed[name] = int(number)
+    return parsed
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def should_retry(method: str, status: Optional[int]) -> bool:
+    """
+    Whether a failed request may be sent again
+
+    429 means the request was rejected before processing, so any method can
+    be retried. Server errors and dropped connections (status None) are only
+    retried for idempotent methods.
+    """
+    if status == 429:
+        return True
+    if status is not None and status not in RETRY_STATUSES:
+        return False
+    return method.upper() in IDEMPOTENT_METHODS
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than Retry-After"""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every request in the process
+
+    Each response's X-Rate-Limit header updates the remaining quota. While the
+    quota is healthy requests only pay for bursts; once it drops below the low
+    water mark the refill rate shrinks so the remaining quota is spread over
+    the window, and every thread sharing the bucket slows down together.
+    """
+
+    def __init__(self, hourly_limit: int = HOURLY_LIMIT, burst: int = BURST, max_rate: float = MAX_RATE):
+        self.hourly_limit = hourly_limit
+        self.remaining = hourly_limit
+        self.burst = burst
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Tokens may go negative: later callers queue up behind earlier ones
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every caller for a while (e.g. after a 429 with Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def update(self, headers: Mapping[str, str]):
+        """Adjust pacing from a response's X-Rate-Limit header"""
+        value = headers.get("X-Rate-Limit")
+        if not value:
+            return
+
+        limits = parse_rate_limit(value)
+        with self._lock:
+            self.hourly_limit = limits.get("user-hour-lim", self.hourly_limit)
+            self.remaining = limits.get("user-hour-rem", self.remaining)
+
+            if self.remaining >= self.hourly_limit * LOW_WATER:
+                self.rate = self.max_rate
+            else:
+                # Spread what is left over the window (but never stall completely)
+                self.rate = max(self.remaining, 1) / WINDOW
+            self._tokens = min(self._tokens, float(max(self.remaining, 0)))
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide RateLimiter"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
@@ -20,7 +20,8 @@ from deployment.bundle import register_bundle_id
 from deployment.config import BUNDLE_ID, APP_NAME
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
     print("=" * 60)
     print("🚀 SlideCast Bundle ID Registration")
     print("=" * 60)
@@ -28,10 +29,10 @@ def main():
     print(f"Bundle ID: {BUNDLE_ID}")
     print()
 
+    api = None
     try:
         # Initialize API client
         api = AppStoreAPI()
-        print("✅ Connected to App Store Connect API")
 
         # Register bundle ID
         if register_bundle_id(api):
@@ -66,6 +67,10 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        if api is not None:
+            api.close()
+            api.metrics.export("register_bundle")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,153 @@
+"""Streaming Subprocess Runner with phase progress for xcodebuild and altool"""
+
+import re
+import time
+import queue
+import threading
+import subprocess
+from collections import deque
+from typing import Dict, List, Optional, Callable, Any, Sequence
+
+# Phase name -> pattern marking a line as part of that phase
+PHASES = {
+    "compile": re.compile(r"^(CompileSwift|SwiftCompile|CompileC|CompileAssetCatalog|CompileStoryboard|CompileXIB)\b"),
+    "link": re.compile(r"^Ld\b"),
+    "codesign": re.compile(r"^CodeSign\b"),
+    "archive": re.compile(r"^\*\* ARCHIVE SUCCEEDED \*\*"),
+    "export": re.compile(r"^\*\* EXPORT SUCCEEDED \*\*|Exported .* to:"),
+    # altool's progress ("Upload progress: 42%") and status lines only
+    "upload": re.compile(r"(?i)\bupload(ing)? progress\b|^\W*UPLOAD SUCCEEDED\b|^No errors uploading\b"),
+}
+# Upload percentage as printed by altool, e.g. "Upload progress: 42%"
+PERCENT = re.compile(r"(\d{1,3}(?:\.\d+)?)\s*%")
+# Lines worth keeping from a failed run however long its log was
+ERROR = re.compile(r"(?i)(\berror\b[:\s]|\*\* [A-Z ]+ FAILED \*\*|\bfatal\b)")
+
+TAIL_LINES = 200  # Last lines kept for the failure report
+MAX_ERROR_LINES = 50
+QUEUE_LINES = 1000  # Lines buffered between the pipe readers and the parser
+PERCENT_STEP = 10  # Upload progress is reported every this many percent
+
+
+class CommandResult:
+    """Exit status, per-phase timings and the parts of the log worth showing"""
+
+    def __init__(self, command: Sequence[str], returncode: int, seconds: float,
+                 phases: Dict[str, Dict[str, float]], tail: List[str], errors: List[str]):
+        self.command = list(command)
+        self.returncode = returncode
+        self.seconds = seconds
+        self.phases = phases
+        self.tail = tail
+        self.errors = errors
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    def print_failure(self, lines: int = 30):
+        """Matched error lines, then the end of the log"""
+        if self.errors:
+            print("   Errors:")
+            for line in self.errors:
+                print(f"     {line}")
+        print(f"   Last {min(lines, len(self.tail))} lines of output:")
+        for line in self.tail[-lines:]:
+            print(f"     {line}")
+
+
+def print_event(event: Dict[str, Any]):
+    """Default progress printer: one line per phase reached and per upload step"""
+    if event["type"] == "phase":
+        print(f"   ▸ {event['phase']} (+{event['elapsed']:.1f}s)")
+    elif event["type"] == "progress":
+        print(f"   ▸ upload {event['percent']:.0f}% (+{event['elapsed']:.1f}s)")
+
+
+def read_lines(pipe, stream: str, lines: "queue.Queue"):
+    """Forward a pipe's lines to the queue, then a None marker"""
+    try:
+        for line in pipe:
+            lines.put((stream, line.rstrip("\r\n")))
+    finally:
+        pipe.close()
+        lines.put((stream, None))
+
+
+def run_command(command: Sequence[str], env: Optional[Dict[str, str]] = None,
+                on_event: Optional[Callable[[Dict[str, Any]], None]] = print_event,
+                tail_lines: int = TAIL_LINES) -> CommandResult:
+    """
+    Run a command, streaming stdout and stderr line by line
+
+    Nothing but a rolling tail of the output and the lines matching ERROR is
+    kept, so memory stays flat however much the command logs. The first line
+    matching each PHASES pattern produces a timed progress event; error lines
+    never count as phase markers.
+
+    Returns:
+        CommandResult (a command that cannot start gets returncode 127)
+    """
+    start = time.perf_counter()
+    tail = deque(maxlen=tail_lines)
+    errors: List[str] = []
+    phases: Dict[str, Dict[str, float]] = {}
+    reported_percent = -PERCENT_STEP
+
+    try:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, env=env, text=True, errors="replace", bufsize=1)
+    except OSError as e:
+        return CommandResult(command, 127, 0.0, {}, [str(e)], [str(e)])
+
+    lines = queue.Queue(maxsize=QUEUE_LINES)
+    readers = [
+        threading.Thread(target=read_lines, args=(process.stdout, "stdout", lines), daemon=True),
+        threading.Thread(target=read_lines, args=(process.stderr, "stderr", lines), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    open_streams = len(readers)
+    while open_streams:
+        stream, line = lines.get()
+        if line is None:
+            open_streams -= 1
+            continue
+
+        now = time.perf_counter() - start
+        tail.append(line)
+        if ERROR.search(line):
+            if len(errors) < MAX_ERROR_LINES:
+                errors.append(line)
+            continue
+
+        for name, pattern in PHASES.items():
+            if not pattern.search(line):
+                continue
+            # Parallel builds interleave phases, so each is announced only when first seen
+            if name not in phases and on_event:
+                on_event({"type": "phase", "phase": name, "elapsed": now, "line": line})
+            phase = phases.setdefault(name, {"start": now, "end": now, "lines": 0})
+            phase["end"] = now
+            phase["lines"] += 1
+            if name == "upload":
+                match = PERCENT.search(line)
+                if match and float(match.group(1)) >= reported_percent + PERCENT_STEP:
+                    reported_percent = float(match.group(1))
+                    if on_event:
+                        on_event({"type": "progress", "phase": name, "percent": reported_percent,
+                                  "elapsed": now, "line": line})
+            break
+
+    returncode = process.wait()
+    for reader in readers:
+        reader.join()
+
+    return CommandResult(command, returncode, time.perf_counter() - start, phases, list(tail), errors)
+
+
+def print_phases(result: CommandResult):
+    """How long each phase seen in the output took"""
+    for name, phase in result.phases.items():
+        print(f"   {name:10} {phase['end'] - phase['start']:6.1f}s  ({int(phase['lines'])} lines)")
@@ -1,11 +1,25 @@
 """Screenshot Upload via App Store Connect API"""
 
 import os
-import requests
+import mmap
+import time
+import asyncio
 import hashlib
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from .api import AppStoreAPI
+from .async_api import AsyncAppStoreAPI
+from .config import UPLOAD_CONCURRENCY, PART_CONCURRENCY, LOCALE_CONCURRENCY
+from .hashes import get_hash_cache, file_key, md5_file
+from .journal import get_upload_journal
+from .images import validate_screenshots, optimize_screenshots
+from .locales import locale_dirs, remote_locales, match_locales, fan_out, print_locale_report
 
+# One folder per locale, named by its App Store Connect locale code
+SCREENSHOTS_ROOT = "deployment/screenshots"
 
 # Display size type mapping for App Store Connect API
 DISPLAY_TYPES = {
@@ -16,49 +30,23 @@ DISPLAY_TYPES = {
 }
 
 
-def get_file_info(file_path: str):
-    """Get file size and checksum"""
-    file_size = os.path.getsize(file_path)
-
-    # Calculate MD5 checksum
-    md5_hash = hashlib.md5()
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b''):
-            md5_hash.update(chunk)
+# Delivery states an asset settles in once Apple has processed it
+FINAL_STATES = {"COMPLETE", "FAILED"}
+# Processing poll interval: starts short, doubles while nothing changes
+POLL_INTERVAL = 2.0
+POLL_MAX_INTERVAL = 30.0
+PROCESSING_TIMEOUT = 600
+# Times a screenshot Apple failed to process is uploaded again
+PROCESSING_RETRIES = 2
 
-    return file_size, md5_hash.hexdigest()
 
+def get_file_info(file_path: str):
+    """Get file size and checksum (cached until the file changes)"""
+    return get_hash_cache().file_info(file_path)
 
-def upload_screenshots(api: AppStoreAPI, version_id: str, screenshots_dir: str = "deployment/screenshots/en-US") -> bool:
-    """
-    Upload screenshots for app version
-
-    Args:
-        api: AppStoreAPI instance
-        version_id: App Store version ID
-        screenshots_dir: Directory containing screenshots
-    """
-    print(f"\n📸 Uploading screenshots from {screenshots_dir}...")
-
-    screenshots_path = Path(screenshots_dir)
-    if not screenshots_path.exists():
-        print(f"❌ Screenshots directory not found: {screenshots_dir}")
-        return False
-
-    # Get version's localizations
-    print(f"\n🔍 Getting version localizations...")
-    localizations = api.get(f"appStoreVersions/{version_id}/appStoreVersionLocalizations")
-
-    if not localizations.get("data"):
-        print("❌ No localizations found for version")
-        return False
-
-    # Assume en-US localization (first one)
-    localization_id = localizations["data"][0]["id"]
-    locale = localizations["data"][0]["attributes"]["locale"]
-    print(f"✅ Using localization: {locale} ({localization_id})")
 
-    # Group screenshots by display type
+def group_screenshots(screenshots_path: Path) -> Dict[str, List[str]]:
+    """Group screenshot files by display key based on their filename prefix"""
     screenshot_groups = {
         "iphone67": [],
         "iphone65": [],
@@ -77,63 +65,128 @@ def upload_screenshots(api: AppStoreAPI, version_id: str, screenshots_dir: str =
         elif filename.startswith("3_ipad"):
             screenshot_groups["ipad"].append(str(file))
 
-    # Upload each group
-    success = True
-    for display_key, files in screenshot_groups.items():
-        if not files:
-            continue
+    return screenshot_groups
 
-        display_type = DISPLAY_TYPES[display_key]
-        print(f"\n📱 Processing {display_key} ({len(files)} screenshots)...")
 
-        # Get or create screenshot set
-        screenshot_set_id = get_or_create_screenshot_set(api, localization_id, display_type)
-        if not screenshot_set_id:
-            print(f"❌ Failed to create screenshot set for {display_key}")
-            success = False
-            continue
+def prepare_screenshots(screenshots_path: Path, optimize: bool = True) -> Optional[Dict[str, List[str]]]:
+    """
+    Group a folder's screenshots by display type, rejecting wrong pixel sizes
+    before anything is reserved and swapping in losslessly optimized copies
 
-        # Upload each screenshot in the group
-        for idx, file_path in enumerate(files, 1):
-            print(f"\n  📤 Uploading {Path(file_path).name} ({idx}/{len(files)})...")
-            if not upload_single_screenshot(api, screenshot_set_id, file_path):
-                print(f"  ❌ Failed to upload {Path(file_path).name}")
-                success = False
-            else:
-                print(f"  ✅ Uploaded {Path(file_path).name}")
+    Returns:
+        {display_type: [file_path, ...]}, or None if any screenshot is invalid
+    """
+    groups = {display_key: files for display_key, files in group_screenshots(screenshots_path).items() if files}
 
-    if success:
-        print(f"\n✅ All screenshots uploaded successfully!")
-    else:
-        print(f"\n⚠️  Some screenshots failed to upload")
+    errors = validate_screenshots(groups)
+    if errors:
+        print("❌ Invalid screenshots:")
+        for error in errors:
+            print(f"  - {error}")
+        return None
 
-    return success
+    if optimize:
+        optimized = optimize_screenshots([file_path for files in groups.values() for file_path in files])
+        groups = {display_key: [optimized[file_path] for file_path in files] for display_key, files in groups.items()}
+
+    return {DISPLAY_TYPES[display_key]: files for display_key, files in groups.items()}
 
 
-def get_or_create_screenshot_set(api: AppStoreAPI, localization_id: str, display_type: str) -> str:
-    """Get existing screenshot set or create new one"""
+def screenshot_sets_url(localization_id: str) -> str:
+    """
+    Compound-document URL returning a localization's screenshot sets with their
+    screenshots included, so the whole tree arrives in one response
+    """
+    return (
+        f"appStoreVersionLocalizations/{localization_id}/appScreenshotSets"
+        f"?include=appScreenshots&limit=50&limit[appScreenshots]=10"
+        f"&fields[appScreenshotSets]=screenshotDisplayType,appScreenshots"
+        f"&fields[appScreenshots]=fileName,fileSize,sourceFileChecksum,assetDeliveryState"
+    )
 
-    # Check if screenshot set already exists
-    existing = api.get(f"appStoreVersionLocalizations/{localization_id}/appScreenshotSets")
 
-    # Filter manually to find matching display type
-    for screenshot_set in existing.get("data", []):
-        if screenshot_set["attributes"]["screenshotDisplayType"] == display_type:
-            screenshot_set_id = screenshot_set["id"]
-            print(f"  ✅ Found existing screenshot set: {screenshot_set_id}")
+def index_screenshot_sets(page: Dict, index: Dict[str, Dict]):
+    """
+    Add one page of screenshot sets to an index keyed by display type:
+    {display_type: {"id": set_id, "screenshots": [appScreenshot, ...]}}
+    """
+    included = {(item["type"], item["id"]): item for item in page.get("included", [])}
+
+    for screenshot_set in page["data"]:
+        refs = screenshot_set.get("relationships", {}).get("appScreenshots", {}).get("data") or []
+        index[screenshot_set["attributes"]["screenshotDisplayType"]] = {
+            "id": screenshot_set["id"],
+            # Relationship order is the set's display order
+            "screenshots": [
+                included.get(("appScreenshots", ref["id"]), {"type": "appScreenshots", "id": ref["id"]})
+                for ref in refs
+            ]
+        }
 
-            # Delete existing screenshots in the set
-            screenshots = api.get(f"appScreenshotSets/{screenshot_set_id}/appScreenshots")
-            if screenshots.get("data"):
-                print(f"  🗑️  Deleting {len(screenshots['data'])} existing screenshots...")
-                for screenshot in screenshots["data"]:
-                    api.delete(f"appScreenshots/{screenshot['id']}")
 
-            return screenshot_set_id
+def load_screenshot_sets(api: AppStoreAPI, localization_id: str,
+                         revalidate: bool = False) -> Optional[Dict[str, Dict]]:
+    """
+    Load a localization's screenshot sets and screenshots, indexed by display type
 
-    # Create new screenshot set
-    print(f"  📦 Creating new screenshot set for {display_type}...")
-    payload = {
+    Args:
+        revalidate: Bypass fresh response-cache entries (for polling)
+    """
+    index = {}
+    url = screenshot_sets_url(localization_id)
+
+    while url:
+        page = api.get(url, revalidate=revalidate)
+        if "data" not in page:
+            print(f"  ❌ Failed to load screenshot sets: {page.get('error')}")
+            return None
+        index_screenshot_sets(page, index)
+        url = page.get("links", {}).get("next")
+
+    return index
+
+
+def diff_screenshots(remote: List[Dict], files: List[str]) -> Tuple[Dict[str, str], List[str], List[str]]:
+    """
+    Match local files against a set's remote screenshots by filename and checksum
+
+    Returns:
+        keep: {file_path: screenshot_id} for files already uploaded unchanged
+        delete: Remote screenshot ids with no matching local file
+        upload: Local files that are new or changed
+    """
+    available: Dict[Tuple[str, str], List[str]] = {}
+    for screenshot in remote:
+        attributes = screenshot.get("attributes", {})
+        state = (attributes.get("assetDeliveryState") or {}).get("state")
+        if state == "FAILED":
+            continue  # Re-upload anything Apple could not process
+        key = (attributes.get("fileName"), attributes.get("sourceFileChecksum"))
+        available.setdefault(key, []).append(screenshot["id"])
+
+    infos = get_hash_cache().file_infos(files)
+    keep = {}
+    upload = []
+    for file_path in files:
+        key = (Path(file_path).name, infos[file_path][1])
+        if available.get(key):
+            keep[file_path] = available[key].pop(0)
+        else:
+            upload.append(file_path)
+
+    kept = set(keep.values())
+    delete = [screenshot["id"] for screenshot in remote if screenshot["id"] not in kept]
+    return keep, delete, upload
+
+
+def reorder_payload(screenshot_ids: List[str]) -> Dict:
+    """Request body to set the display order of a screenshot set"""
+    return {"data": [{"type": "appScreenshots", "id": screenshot_id} for screenshot_id in screenshot_ids]}
+
+
+def screenshot_set_payload(localization_id: str, display_type: str) -> Dict:
+    """Request body to create a screenshot set"""
+    return {
         "data": {
             "type": "appScreenshotSets",
             "attributes": {
@@ -150,25 +203,10 @@ def get_or_create_screenshot_set(api: AppStoreAPI, localization_id: str, display
         }
     }
 
-    result = api.post("appScreenshotSets", payload)
-
-    if "data" in result:
-        screenshot_set_id = result["data"]["id"]
-        print(f"  ✅ Created screenshot set: {screenshot_set_id}")
-        return screenshot_set_id
-    else:
-        print(f"  ❌ Failed to create screenshot set: {result.get('error')}")
-        return None
-
-
-def upload_single_screenshot(api: AppStoreAPI, screenshot_set_id: str, file_path: str) -> bool:
-    """Upload a single screenshot"""
 
-    file_size, checksum = get_file_info(file_path)
-    filename = Path(file_path).name
-
-    # Step 1: Reserve screenshot slot
-    reserve_payload = {
+def reserve_payload(screenshot_set_id: str, filename: str, file_size: int) -> Dict:
+    """Request body to reserve a screenshot slot"""
+    return {
         "data": {
             "type": "appScreenshots",
             "attributes": {
@@ -186,49 +224,710 @@ def upload_single_screenshot(api: AppStoreAPI, screenshot_set_id: str, file_path
         }
     }
 
-    reserve_result = api.post("appScreenshots", reserve_payload)
+
+def commit_payload(screenshot_id: str, checksum: str) -> Dict:
+    """Request body to mark a screenshot as uploaded"""
+    return {
+        "data": {
+            "type": "appScreenshots",
+            "id": screenshot_id,
+            "attributes": {
+                "sourceFileChecksum": checksum,
+                "uploaded": True
+            }
+        }
+    }
+
+
+def upload_screenshots(api: AppStoreAPI, version_id: str, screenshots_root: str = SCREENSHOTS_ROOT,
+                       concurrency: int = UPLOAD_CONCURRENCY, locale_concurrency: int = LOCALE_CONCURRENCY) -> bool:
+    """
+    Upload screenshots for app version, one screenshots/<locale>/ folder per localization
+
+    Args:
+        api: AppStoreAPI instance
+        version_id: App Store version ID
+        screenshots_root: Directory containing one screenshot folder per locale
+        concurrency: Screenshot steps in flight at once, shared by all locales
+        locale_concurrency: Locales synced at once
+    """
+    print(f"\n📸 Uploading screenshots from {screenshots_root}...")
+
+    local = locale_dirs(screenshots_root)
+    if not local:
+        print(f"❌ No locale folders found in: {screenshots_root}")
+        return False
+
+    # Get version's localizations
+    print(f"\n🔍 Getting version localizations...")
+    remote = remote_locales(api, f"appStoreVersions/{version_id}/appStoreVersionLocalizations",
+                            "appStoreVersionLocalizations")
+    if not remote:
+        print("❌ No localizations found for version")
+        return False
+
+    matched, unmatched = match_locales(local, remote)
+    print(f"✅ Syncing {len(matched)} localizations: {', '.join(matched)}")
+
+    # Locales run side by side and split the step budget, so the total number of
+    # steps in flight (and connections per host) stays at `concurrency`
+    workers = max(1, min(locale_concurrency, len(matched)))
+    per_locale = max(1, concurrency // workers)
+    results = fan_out({
+        locale: partial(upload_localization_screenshots, api, localization_id, Path(folder), per_locale)
+        for locale, (folder, localization_id) in matched.items()
+    }, concurrency=workers)
+    print_locale_report("Screenshots", results, unmatched)
+
+    success = bool(results) and all(results.values())
+    if success:
+        print(f"\n✅ All screenshots uploaded successfully!")
+    else:
+        print(f"\n⚠️  Some screenshots failed to upload")
+
+    return success
+
+
+def upload_localization_screenshots(api: AppStoreAPI, localization_id: str, screenshots_path: Path,
+                                    concurrency: int = UPLOAD_CONCURRENCY, optimize: bool = True,
+                                    wait: bool = True) -> bool:
+    """Sync a directory of screenshots into one version localization"""
+
+    # Load existing sets and their screenshots in one round-trip
+    screenshot_sets = load_screenshot_sets(api, localization_id)
+    if screenshot_sets is None:
+        return False
+
+    # Group screenshots by display type, validated and optimized
+    groups = prepare_screenshots(screenshots_path, optimize)
+    if groups is None:
+        return False
+    for display_type, files in groups.items():
+        print(f"\n📱 {display_type}: {len(files)} screenshots")
+
+    # Checksum files that get diffed against existing sets in one batch so large
+    # misses share the thread pool; files for new sets are hashed while uploading
+    get_hash_cache().file_infos([
+        file_path for display_type, files in groups.items() if display_type in screenshot_sets
+        for file_path in files
+    ])
+
+    results = run_screenshot_pipeline(api, localization_id, groups, screenshot_sets, concurrency, wait)
+
+    print()
+    for file_path, result in results.items():
+        state = result.get("state")
+        if result["status"] == "unchanged":
+            print(f"  ⏭️  Unchanged {Path(file_path).name}")
+        elif result["status"] == "uploaded" and state in (None, "COMPLETE"):
+            print(f"  ✅ Uploaded {Path(file_path).name}")
+        elif result["status"] == "uploaded":
+            print(f"  ⏳ Uploaded {Path(file_path).name} (still {state})")
+        elif state == "FAILED":
+            print(f"  ❌ Apple could not process {Path(file_path).name}")
+        else:
+            print(f"  ❌ Failed to upload {Path(file_path).name}")
+
+    states = [result["state"] for result in results.values() if "state" in result]
+    if states:
+        print(f"\n  Processing: {states.count('COMPLETE')} complete, {states.count('FAILED')} failed, "
+              f"{sum(1 for state in states if state not in FINAL_STATES)} still processing")
+
+    unordered = [display_type for display_type, files in groups.items()
+                 if any(results[file_path].get("reorder_failed") for file_path in files)]
+    for display_type in unordered:
+        print(f"  ⚠️  {display_type} screenshots are uploaded but not in file order")
+
+    return not unordered and all(result["status"] != "failed" for result in results.values())
+
+
+def order_changed(remote: List[Dict], keep: Dict[str, str], upload: List[str], files: List[str]) -> bool:
+    """
+    Whether a synced set ends up out of file order, given that kept
+    screenshots stay in their remote order and uploads are appended
+    """
+    remote_order = [screenshot["id"] for screenshot in remote]
+    kept = sorted(keep, key=lambda file_path: remote_order.index(keep[file_path]))
+    return kept + upload != list(files)
+
+
+def delivery_state(screenshot: Dict) -> Optional[str]:
+    """assetDeliveryState.state of an appScreenshot resource"""
+    return (screenshot.get("attributes", {}).get("assetDeliveryState") or {}).get("state")
+
+
+def wait_for_processing(api: AppStoreAPI, localization_id: str, screenshot_ids: List[str],
+                        timeout: float = PROCESSING_TIMEOUT) -> Dict[str, Optional[str]]:
+    """
+    Poll committed screenshots until each is COMPLETE or FAILED
+
+    Each poll is one compound request for the whole localization, however many
+    screenshots are tracked. The interval doubles while nothing settles and
+    drops back once something does.
+
+    Returns:
+        {screenshot_id: last seen delivery state} (not final if the timeout hit)
+    """
+    states: Dict[str, Optional[str]] = {screenshot_id: None for screenshot_id in screenshot_ids}
+    interval = POLL_INTERVAL
+    deadline = time.monotonic() + timeout
+    pending = len(states)
+
+    while True:
+        screenshot_sets = load_screenshot_sets(api, localization_id, revalidate=True) or {}
+        for screenshot_set in screenshot_sets.values():
+            for screenshot in screenshot_set["screenshots"]:
+                if screenshot["id"] in states:
+                    states[screenshot["id"]] = delivery_state(screenshot)
+
+        still_pending = sum(1 for state in states.values() if state not in FINAL_STATES)
+        if not still_pending or time.monotonic() + interval > deadline:
+            return states
+
+        interval = POLL_INTERVAL if still_pending < pending else min(interval * 2, POLL_MAX_INTERVAL)
+        pending = still_pending
+        print(f"  ⏳ {still_pending}/{len(states)} screenshots processing, checking again in {interval:.0f}s")
+        time.sleep(interval)
+
+
+def requeue_screenshot(api: AppStoreAPI, screenshot_set_id: str, screenshot_id: str, file_path: str) -> Optional[str]:
+    """Replace a screenshot Apple failed to process with a fresh upload"""
+    api.delete(f"appScreenshots/{screenshot_id}")
+    return upload_single_screenshot(api, screenshot_set_id, file_path)
+
+
+def run_screenshot_pipeline(api: AppStoreAPI, localization_id: str, groups: Dict[str, List[str]],
+                            screenshot_sets: Dict[str, Dict], concurrency: int = UPLOAD_CONCURRENCY,
+                            wait: bool = True) -> Dict[str, Dict]:
+    """
+    Sync the screenshots of several sets using a bounded worker pool
+
+    Local files are matched against each set by filename and checksum: missing
+    sets are created and removed screenshots deleted in parallel, new or
+    changed files are reserved/uploaded/committed as soon as their set is
+    ready, reservations recorded in the upload journal by an interrupted run
+    are finished, and a set is reordered through its relationship endpoint
+    only when its final order would differ from the file order. With wait,
+    new uploads are polled until Apple has processed them and any that
+    FAILED are uploaded again (up to PROCESSING_RETRIES times).
+
+    Args:
+        groups: {display_type: [file_path, ...]} in display order
+        screenshot_sets: Index from load_screenshot_sets
+        concurrency: Steps in flight at once
+        wait: Poll the delivery state of new uploads before returning
+
+    Returns:
+        {file_path: {"id": screenshot_id or None, "status": "uploaded" | "unchanged" | "failed",
+                     "state": last delivery state, for uploads that were waited on,
+                     "reorder_failed": True, for every file of a set that could not be put in order}}
+    """
+    results = {
+        file_path: {"id": None, "status": "failed"}
+        for files in groups.values() for file_path in files
+    }
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Create missing sets and delete screenshots that no longer have a local file
+        creating = {}
+        deleting = {}
+        diffs = {}
+        for display_type, files in groups.items():
+            existing = screenshot_sets.get(display_type)
+            if existing:
+                # Reservations an interrupted run left behind are finished, not redone
+                resume = resumable_screenshots(existing, files)
+                resumed_ids = {entry["id"] for entry in resume.values()}
+                keep, delete, upload = diff_screenshots(
+                    [screenshot for screenshot in existing["screenshots"] if screenshot["id"] not in resumed_ids],
+                    [file_path for file_path in files if file_path not in resume]
+                )
+                deleting[display_type] = [
+                    executor.submit(api.delete, f"appScreenshots/{screenshot_id}") for screenshot_id in delete
+                ]
+            else:
+                keep, upload, resume = {}, list(files), {}
+                creating[display_type] = executor.submit(create_screenshot_set, api, localization_id, display_type)
+            diffs[display_type] = (keep, upload, resume)
+
+            for file_path, screenshot_id in keep.items():
+                results[file_path] = {"id": screenshot_id, "status": "unchanged"}
+
+        # Queue each set's uploads once that set is ready
+        set_ids = {}
+        uploads = {}
+        for display_type, files in groups.items():
+            if display_type in creating:
+                set_ids[display_type] = creating[display_type].result()
+            else:
+                set_ids[display_type] = screenshot_sets[display_type]["id"]
+                if not all(future.result() for future in deleting[display_type]):
+                    print(f"  ⚠️  Could not delete every removed {display_type} screenshot")
+
+            if not set_ids[display_type]:
+                continue
+            keep, upload, resume = diffs[display_type]
+            for file_path in upload:
+                uploads[file_path] = executor.submit(upload_single_screenshot, api, set_ids[display_type], file_path)
+            for file_path, entry in resume.items():
+                uploads[file_path] = executor.submit(resume_screenshot, api, set_ids[display_type], file_path, entry)
+
+        for file_path, future in uploads.items():
+            screenshot_id = future.result()
+            if screenshot_id:
+                results[file_path] = {"id": screenshot_id, "status": "uploaded"}
+
+        # Wait until Apple has processed the new uploads; failed ones are queued again
+        display_types = {file_path: display_type for display_type, files in groups.items() for file_path in files}
+        requeued_types = set()
+        waiting = {result["id"]: file_path for file_path, result in results.items() if result["status"] == "uploaded"}
+        retries = 0
+        while wait and waiting:
+            states = wait_for_processing(api, localization_id, list(waiting))
+            failed = {}
+            for screenshot_id, file_path in waiting.items():
+                results[file_path]["state"] = states[screenshot_id]
+                if states[screenshot_id] == "FAILED":
+                    failed[screenshot_id] = file_path
+
+            if not failed or retries == PROCESSING_RETRIES:
+                for file_path in failed.values():
+                    results[file_path]["status"] = "failed"
+                break
+
+            retries += 1
+            print(f"  🔁 Uploading {len(failed)} screenshots again that Apple could not process")
+            requeued = {
+                file_path: executor.submit(requeue_screenshot, api, set_ids[display_types[file_path]],
+                                           screenshot_id, file_path)
+                for screenshot_id, file_path in failed.items()
+            }
+            waiting = {}
+            for file_path, future in requeued.items():
+                requeued_types.add(display_types[file_path])
+                screenshot_id = future.result()
+                results[file_path] = {"id": screenshot_id, "status": "uploaded" if screenshot_id else "failed"}
+                if screenshot_id:
+                    waiting[screenshot_id] = file_path
+
+        # Parallel uploads land in any order, so reorder whenever more than one
+        # was added, one was resumed or requeued, or the kept screenshots are out of place
+        reordering = {}
+        for display_type, files in groups.items():
+            keep, upload, resume = diffs[display_type]
+            remote = screenshot_sets.get(display_type, {}).get("screenshots", [])
+            screenshot_ids = [results[file_path]["id"] for file_path in files]
+            if all(screenshot_ids) and (len(upload) > 1 or resume or display_type in requeued_types
+                                        or order_changed(remote, keep, upload, files)):
+                reordering[display_type] = executor.submit(
+                    api.patch, f"appScreenshotSets/{set_ids[display_type]}/relationships/appScreenshots",
+                    reorder_payload(screenshot_ids)
+                )
+
+        for display_type, future in reordering.items():
+            result = future.result()
+            if "error" in result:
+                print(f"  ❌ Failed to order {display_type} screenshots: {result['error']}")
+                # The screenshots themselves are on App Store Connect, just out of order
+                for file_path in groups[display_type]:
+                    results[file_path]["reorder_failed"] = True
+
+    return results
+
+
+def resumable_screenshots(screenshot_set: Dict, files: List[str]) -> Dict[str, Dict]:
+    """
+    Journaled reservations in a set that can be finished instead of redone:
+    unexpired, still uncommitted remotely, and for a file that has not changed
+
+    Returns:
+        {file_path: journal entry}
+    """
+    journal = get_upload_journal()
+    pending = journal.pending(screenshot_set["id"])
+    remote = {screenshot["id"]: screenshot for screenshot in screenshot_set["screenshots"]}
+
+    resumable = {}
+    for file_path in files:
+        entry = pending.get(os.path.abspath(file_path))
+        if not entry:
+            continue
+        screenshot = remote.get(entry["id"])
+        if (screenshot is None or screenshot.get("attributes", {}).get("sourceFileChecksum")
+                or file_key(file_path) != entry["file_key"]):
+            # Deleted, already committed, or the file changed since it was reserved
+            journal.discard(entry["id"])
+            continue
+        resumable[file_path] = entry
+    return resumable
+
+
+def create_screenshot_set(api: AppStoreAPI, localization_id: str, display_type: str) -> Optional[str]:
+    """Create a screenshot set, returning its id (None on failure)"""
+    print(f"  📦 Creating new screenshot set for {display_type}...")
+    result = api.post("appScreenshotSets", screenshot_set_payload(localization_id, display_type))
+
+    if "data" in result:
+        screenshot_set_id = result["data"]["id"]
+        print(f"  ✅ Created screenshot set: {screenshot_set_id}")
+        return screenshot_set_id
+    else:
+        print(f"  ❌ Failed to create screenshot set: {result.get('error')}")
+        return None
+
+
+class FileSlice:
+    """
+    Read-only file object over bytes [offset, offset + length) of an open file
+
+    requests streams it into the request body a block at a time, so a part is
+    never held in memory whole. Bytes are fed to `digest` the first time they
+    are read; a retry rewinds the slice with seek(0) without hashing them twice.
+    """
+
+    def __init__(self, f, offset: int, length: int, digest=None):
+        self._fd = f.fileno()
+        self.offset = offset
+        self.length = length
+        self.digest = digest
+        self.hashed = 0
+        self._position = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, position: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: self.length}[whence]
+        self._position = min(max(base + position, 0), self.length)
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self.length - self._position
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b''
+
+        start = self._position
+        data = os.pread(self._fd, size, self.offset + start)
+        self._position += len(data)
+
+        if self.digest is not None and self._position > self.hashed:
+            self.digest.update(data[self.hashed - start:] if self.hashed > start else data)
+            self.hashed = self._position
+        return data
+
+
+def send_part(api: AppStoreAPI, operation: Dict, body) -> bool:
+    """PUT one uploadOperations part"""
+    headers = {header["name"]: header["value"] for header in operation.get("requestHeaders", [])}
+    response = api.upload_part(operation["url"], body, headers)
+    if response.status_code not in [200, 201, 204]:
+        print(f"    ❌ Failed to upload chunk at offset {operation['offset']}: {response.status_code}")
+        return False
+    return True
+
+
+def upload_operation(api: AppStoreAPI, data: memoryview, operation: Dict, screenshot_id: str) -> bool:
+    """PUT one uploadOperations part, sliced from data without copying it"""
+    offset = operation["offset"]
+    part = data[offset:offset + operation["length"]]
+    try:
+        if not send_part(api, operation, part):
+            return False
+    finally:
+        part.release()
+
+    get_upload_journal().part_done(screenshot_id, offset)
+    return True
+
+
+def map_file(f):
+    """Read-only memory map of an open file; an empty file cannot be mapped and maps to b"""""
+    if os.fstat(f.fileno()).st_size == 0:
+        return contextlib.nullcontext(b"")
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def upload_parts_mapped(api: AppStoreAPI, file_path: str, upload_operations: List[Dict], screenshot_id: str) -> bool:
+    """Upload parts concurrently, straight from a memory map"""
+    with open(file_path, 'rb') as f, map_file(f) as mapped:
+        view = memoryview(mapped)
+        try:
+            workers = max(1, min(PART_CONCURRENCY, len(upload_operations)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return all(list(executor.map(lambda operation: upload_operation(api, view, operation, screenshot_id),
+                                             upload_operations)))
+        finally:
+            view.release()
+
+
+def upload_parts_streamed(api: AppStoreAPI, file_path: str, upload_operations: List[Dict],
+                          screenshot_id: str) -> Optional[str]:
+    """
+    Upload parts in offset order straight from disk, hashing the bytes as they
+    are sent, and return the file's MD5 (None on failure)
+    """
+    digest = hashlib.md5()
+    hashed = 0
+    with open(file_path, 'rb') as f:
+        for operation in sorted(upload_operations, key=lambda operation: operation["offset"]):
+            # Hash only while parts are contiguous from the start of the file
+            in_order = operation["offset"] == hashed
+            part = FileSlice(f, operation["offset"], operation["length"], digest if in_order else None)
+            if not send_part(api, operation, part):
+                return None
+            get_upload_journal().part_done(screenshot_id, operation["offset"])
+            if in_order and part.hashed == part.length:
+                hashed += part.length
+
+        if hashed == os.fstat(f.fileno()).st_size:
+            return digest.hexdigest()
+
+    # The parts did not cover the file in one pass: fall back to hashing it
+    return md5_file(file_path)
+
+
+def upload_single_screenshot(api: AppStoreAPI, screenshot_set_id: str, file_path: str) -> Optional[str]:
+    """Upload a single screenshot, returning its screenshot id (None on failure)"""
+
+    hash_key, checksum = get_hash_cache().lookup(file_path)
+    file_size = hash_key[1]
+    filename = Path(file_path).name
+
+    # Step 1: Reserve screenshot slot
+    reserve_result = api.post("appScreenshots", reserve_payload(screenshot_set_id, filename, file_size))
 
     if "data" not in reserve_result:
         print(f"    ❌ Failed to reserve screenshot slot: {reserve_result.get('error')}")
+        return None
+
+    screenshot_id = reserve_result["data"]["id"]
+    upload_operations = reserve_result["data"]["attributes"]["uploadOperations"]
+    get_upload_journal().reserved(screenshot_id, screenshot_set_id, hash_key, checksum, upload_operations)
+
+    # Step 2: Upload file parts. With the checksum already known they go out
+    # concurrently from a memory map; otherwise they are streamed once from
+    # disk and hashed on the way, so the file is never read twice
+    if checksum:
+        if not upload_parts_mapped(api, file_path, upload_operations, screenshot_id):
+            return None
+    else:
+        checksum = upload_parts_streamed(api, file_path, upload_operations, screenshot_id)
+        if not checksum:
+            return None
+        get_hash_cache().store(hash_key, checksum)
+
+    # Step 3: Commit the upload
+    return commit_screenshot(api, screenshot_id, checksum)
+
+
+def resume_screenshot(api: AppStoreAPI, screenshot_set_id: str, file_path: str, entry: Dict) -> Optional[str]:
+    """Finish a journaled reservation: upload the parts it is missing, then commit"""
+    remaining = [operation for operation in entry["operations"] if operation["offset"] not in entry["parts_done"]]
+    print(f"  ↩️  Resuming {Path(file_path).name} ({len(remaining)}/{len(entry['operations'])} parts left)")
+
+    if remaining and not upload_parts_mapped(api, file_path, remaining, entry["id"]):
+        # Upload URLs no longer accepted: drop the reservation and start over
+        api.delete(f"appScreenshots/{entry['id']}")
+        get_upload_journal().discard(entry["id"])
+        return upload_single_screenshot(api, screenshot_set_id, file_path)
+
+    return commit_screenshot(api, entry["id"], entry["checksum"] or get_file_info(file_path)[1])
+
+
+def commit_screenshot(api: AppStoreAPI, screenshot_id: str, checksum: str) -> Optional[str]:
+    """Mark a screenshot's upload complete, returning its id (None on failure)"""
+    commit_result = api.patch(f"appScreenshots/{screenshot_id}", commit_payload(screenshot_id, checksum))
+
+    if "data" in commit_result:
+        get_upload_journal().discard(screenshot_id)
+        return screenshot_id
+    else:
+        print(f"    ❌ Failed to commit screenshot: {commit_result.get('error')}")
+        return None
+
+
+# Async variants, for driving uploads concurrently from one event loop
+
+async def upload_screenshots_async(api: AsyncAppStoreAPI, version_id: str, screenshots_root: str = SCREENSHOTS_ROOT,
+                                   locale_concurrency: int = LOCALE_CONCURRENCY) -> bool:
+    """
+    Upload screenshots for app version, one screenshots/<locale>/ folder per localization
+
+    Args:
+        api: AsyncAppStoreAPI instance
+        version_id: App Store version ID
+        screenshots_root: Directory containing one screenshot folder per locale
+        locale_concurrency: Locales synced at once
+    """
+    print(f"\n📸 Uploading screenshots from {screenshots_root}...")
+
+    local = locale_dirs(screenshots_root)
+    if not local:
+        print(f"❌ No locale folders found in: {screenshots_root}")
+        return False
+
+    print(f"\n🔍 Getting version localizations...")
+    remote = {}
+    async for localization in api.iter(f"appStoreVersions/{version_id}/appStoreVersionLocalizations",
+                                       fields={"appStoreVersionLocalizations": "locale"}):
+        remote[localization["attributes"]["locale"]] = localization["id"]
+    if not remote:
+        print("❌ No localizations found for version")
+        return False
+
+    matched, unmatched = match_locales(local, remote)
+    print(f"✅ Syncing {len(matched)} localizations: {', '.join(matched)}")
+
+    semaphore = asyncio.Semaphore(max(1, locale_concurrency))
+
+    async def sync_locale(locale: str, folder: str, localization_id: str) -> bool:
+        async with semaphore:
+            try:
+                return await upload_localization_screenshots_async(api, localization_id, Path(folder))
+            except Exception as e:
+                print(f"  ❌ {locale}: {e}")
+                return False
+
+    outcomes = await asyncio.gather(*(sync_locale(locale, folder, localization_id)
+                                      for locale, (folder, localization_id) in matched.items()))
+    results = dict(zip(matched, outcomes))
+    print_locale_report("Screenshots", results, unmatched)
+
+    success = bool(results) and all(results.values())
+    if success:
+        print(f"\n✅ All screenshots uploaded successfully!")
+    else:
+        print(f"\n⚠️  Some screenshots failed to upload")
+
+    return success
+
+
+async def upload_localization_screenshots_async(api: AsyncAppStoreAPI, localization_id: str,
+                                                screenshots_path: Path) -> bool:
+    """Sync a directory of screenshots into one version localization, display types concurrently"""
+    screenshot_sets = await load_screenshot_sets_async(api, localization_id)
+    if screenshot_sets is None:
         return False
 
+    groups = await asyncio.to_thread(prepare_screenshots, screenshots_path)
+    if groups is None:
+        return False
+
+    async def upload_group(display_type: str, files: List[str]) -> bool:
+        existing = screenshot_sets.get(display_type)
+        if existing:
+            screenshot_set_id = existing["id"]
+            remote = existing["screenshots"]
+            keep, delete, upload = await asyncio.to_thread(diff_screenshots, remote, files)
+            await asyncio.gather(*(api.delete(f"appScreenshots/{screenshot_id}") for screenshot_id in delete))
+        else:
+            screenshot_set_id = await create_screenshot_set_async(api, localization_id, display_type)
+            remote, keep, upload = [], {}, list(files)
+
+        if not screenshot_set_id:
+            print(f"❌ Failed to create screenshot set for {display_type}")
+            return False
+
+        for file_path in keep:
+            print(f"  ⏭️  Unchanged {Path(file_path).name}")
+
+        # Uploads stay sequential within a set so they are appended in file order
+        uploaded = {}
+        for file_path in upload:
+            screenshot_id = await upload_single_screenshot_async(api, screenshot_set_id, file_path)
+            if screenshot_id:
+                uploaded[file_path] = screenshot_id
+                print(f"  ✅ Uploaded {Path(file_path).name}")
+            else:
+                print(f"  ❌ Failed to upload {Path(file_path).name}")
+        if len(uploaded) < len(upload):
+            return False
+
+        if order_changed(remote, keep, upload, files):
+            result = await api.patch(f"appScreenshotSets/{screenshot_set_id}/relationships/appScreenshots",
+                                     reorder_payload([keep.get(file_path) or uploaded[file_path]
+                                                      for file_path in files]))
+            if "error" in result:
+                print(f"  ❌ Failed to order {display_type} screenshots: {result['error']}")
+                return False
+        return True
+
+    results = await asyncio.gather(*(upload_group(display_type, files) for display_type, files in groups.items()))
+    return all(results)
+
+
+async def load_screenshot_sets_async(api: AsyncAppStoreAPI, localization_id: str) -> Optional[Dict[str, Dict]]:
+    """Load a localization's screenshot sets and screenshots, indexed by display type"""
+    index = {}
+    url = screenshot_sets_url(localization_id)
+
+    while url:
+        page = await api.get(url)
+        if "data" not in page:
+            print(f"  ❌ Failed to load screenshot sets: {page.get('error')}")
+            return None
+        index_screenshot_sets(page, index)
+        url = page.get("links", {}).get("next")
+
+    return index
+
+
+async def create_screenshot_set_async(api: AsyncAppStoreAPI, localization_id: str, display_type: str) -> Optional[str]:
+    """Create a screenshot set, returning its id (None on failure)"""
+    print(f"  📦 Creating new screenshot set for {display_type}...")
+    result = await api.post("appScreenshotSets", screenshot_set_payload(localization_id, display_type))
+
+    if "data" in result:
+        screenshot_set_id = result["data"]["id"]
+        print(f"  ✅ Created screenshot set: {screenshot_set_id}")
+        return screenshot_set_id
+    else:
+        print(f"  ❌ Failed to create screenshot set: {result.get('error')}")
+        return None
+
+
+async def upload_single_screenshot_async(api: AsyncAppStoreAPI, screenshot_set_id: str, file_path: str) -> Optional[str]:
+    """Upload a single screenshot, sending its parts concurrently (returns its id, None on failure)"""
+    file_size, checksum = await asyncio.to_thread(get_file_info, file_path)
+    filename = Path(file_path).name
+
+    reserve_result = await api.post("appScreenshots", reserve_payload(screenshot_set_id, filename, file_size))
+
+    if "data" not in reserve_result:
+        print(f"    ❌ Failed to reserve screenshot slot: {reserve_result.get('error')}")
+        return None
+
     screenshot_id = reserve_result["data"]["id"]
     upload_operations = reserve_result["data"]["attributes"]["uploadOperations"]
 
-    # Step 2: Upload file parts
-    with open(file_path, 'rb') as f:
-        for operation in upload_operations:
+    # httpx needs bytes, so each part is copied out of the map only while it is
+    # being sent, and at most PART_CONCURRENCY copies exist at once
+    parts_in_flight = asyncio.Semaphore(PART_CONCURRENCY)
+    with open(file_path, 'rb') as f, map_file(f) as mapped:
+        async def upload_operation(operation: Dict) -> bool:
             offset = operation["offset"]
-            length = operation["length"]
-            url = operation["url"]
             headers = {header["name"]: header["value"] for header in operation.get("requestHeaders", [])}
-
-            # Read the chunk
-            f.seek(offset)
-            chunk = f.read(length)
-
-            # Upload chunk
-            response = requests.put(url, data=chunk, headers=headers)
+            async with parts_in_flight:
+                part = mapped[offset:offset + operation["length"]]
+                response = await api.upload_part(operation["url"], part, headers)
+                del part
             if response.status_code not in [200, 201, 204]:
                 print(f"    ❌ Failed to upload chunk at offset {offset}: {response.status_code}")
                 return False
+            return True
 
-    # Step 3: Commit the upload
-    commit_payload = {
-        "data": {
-            "type": "appScreenshots",
-            "id": screenshot_id,
-            "attributes": {
-                "sourceFileChecksum": checksum,
-                "uploaded": True
-            }
-        }
-    }
+        if not all(await asyncio.gather(*(upload_operation(operation) for operation in upload_operations))):
+            return None
 
-    commit_result = api.patch(f"appScreenshots/{screenshot_id}", commit_payload)
+    commit_result = await api.patch(f"appScreenshots/{screenshot_id}", commit_payload(screenshot_id, checksum))
 
     if "data" in commit_result:
-        return True
+        return screenshot_id
     else:
         print(f"    ❌ Failed to commit screenshot: {commit_result.get('error')}")
-        return False
+        return None
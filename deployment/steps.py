@@ -0,0 +1,151 @@
+"""Dependency-graph Step Scheduler for the build and release flow"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Callable, Iterable, Optional
+
+
+class Step:
+    """
+    One stage of a flow: the values it needs, the values it produces, and how to run it
+
+    run receives the shared context and stores each of its outputs there
+    under the declared name; it returns False (or raises) on failure.
+    """
+
+    def __init__(self, name: str, run: Callable[[Dict[str, Any]], bool],
+                 inputs: Iterable[str] = (), outputs: Iterable[str] = ()):
+        self.name = name
+        self.run = run
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.status = "pending"  # pending, ok, failed, skipped
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def seconds(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class StepGraph:
+    """Steps wired together by matching each step's inputs to another step's outputs"""
+
+    def __init__(self, steps: List[Step]):
+        self.steps = steps
+        producers = {}
+        for step in steps:
+            for output in step.outputs:
+                if output in producers:
+                    raise ValueError(f"{output!r} is produced by both {producers[output].name!r} and {step.name!r}")
+                producers[output] = step
+
+        self.dependencies: Dict[str, List[Step]] = {}
+        for step in steps:
+            missing = [name for name in step.inputs if name not in producers]
+            if missing:
+                raise ValueError(f"{step.name!r} needs {', '.join(missing)}, which no step produces")
+            self.dependencies[step.name] = list(dict.fromkeys(producers[name] for name in step.inputs))
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[Step]:
+        """Steps with every dependency before its dependents; ValueError on a cycle"""
+        order = []
+        done = set()
+        visiting = set()
+
+        def visit(step: Step):
+            if step.name in done:
+                return
+            if step.name in visiting:
+                raise ValueError(f"Steps depend on each other in a cycle through {step.name!r}")
+            visiting.add(step.name)
+            for dependency in self.dependencies[step.name]:
+                visit(dependency)
+            visiting.discard(step.name)
+            done.add(step.name)
+            order.append(step)
+
+        for step in self.steps:
+            visit(step)
+        return order
+
+    def run(self, context: Optional[Dict[str, Any]] = None, concurrency: int = 4) -> bool:
+        """
+        Run every step as soon as its dependencies succeed, independent steps in parallel
+
+        A failed step marks everything downstream of it as skipped; unrelated
+        steps keep running. Returns True only if every step succeeded.
+        """
+        context = {} if context is None else context
+        self.started = time.perf_counter()
+
+        def execute(step: Step) -> bool:
+            step.started = time.perf_counter()
+            try:
+                return bool(step.run(context))
+            except Exception as e:
+                print(f"\n❌ {step.name}: {e}")
+                return False
+            finally:
+                step.finished = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            running = {}
+            while True:
+                # Dependencies come first, so a skip reaches every dependent in one pass
+                for step in self.order:
+                    if step.status != "pending" or step in running.values():
+                        continue
+                    dependencies = self.dependencies[step.name]
+                    if any(dependency.status in ("failed", "skipped") for dependency in dependencies):
+                        step.status = "skipped"
+                    elif all(dependency.status == "ok" for dependency in dependencies):
+                        running[executor.submit(execute, step)] = step
+
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = running.pop(future)
+                    step.status = "ok" if future.result() else "failed"
+                    if step.status == "failed":
+                        print(f"\n❌ Failed at: {step.name}")
+
+        self.finished = time.perf_counter()
+        return all(step.status == "ok" for step in self.steps)
+
+    def critical_path(self) -> List[Step]:
+        """The chain of dependent steps that ends last (what bounded the total time)"""
+        ran = [step for step in self.steps if step.finished is not None]
+        if not ran:
+            return []
+
+        path = [max(ran, key=lambda step: step.finished)]
+        while True:
+            dependencies = [dependency for dependency in self.dependencies[path[-1].name]
+                            if dependency.finished is not None]
+            if not dependencies:
+                return list(reversed(path))
+            path.append(max(dependencies, key=lambda step: step.finished))
+
+    def print_summary(self):
+        """Per-step timings and the critical path"""
+        symbols = {"ok": "✅", "failed": "❌", "skipped": "⏭️ ", "pending": "⏸️ "}
+        print("\n" + "=" * 60)
+        print("⏱️  Step Timings")
+        print("=" * 60)
+        for step in self.steps:
+            offset = f"+{step.started - self.started:6.1f}s" if step.started is not None else " " * 8
+            print(f"  {symbols[step.status]} {step.name:32} {offset} {step.seconds:7.1f}s")
+
+        path = self.critical_path()
+        if path:
+            total = self.finished - self.started
+            serial = sum(step.seconds for step in self.steps)
+            print(f"\n  Critical path: {' → '.join(step.name for step in path)}")
+            print(f"  Total {total:.1f}s ({serial:.1f}s of work, "
+                  f"{sum(step.seconds for step in path):.1f}s on the critical path)")
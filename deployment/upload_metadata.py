@@ -5,7 +5,13 @@ Upload Metadata for Slideshow Cast
 This script uploads app metadata to App Store Connect via API.
 
 Usage:
-    python3 upload_metadata.py
+    python3 upload_metadata.py [--cache] [--record FILE | --replay FILE [--latency SECONDS]]
+
+Options:
+    --cache    Reuse cached API lookups from previous runs (build/cache/api.sqlite)
+    --record   Record every request/response to a cassette file (credentials scrubbed)
+    --replay   Run offline against a recorded cassette
+    --latency  Simulated seconds per replayed request, or "recorded"
 """
 
 import sys
@@ -15,12 +21,15 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from deployment.api import AppStoreAPI
+from deployment.cache import ResponseCache
+from deployment.cassette import cassette_from_args
 from deployment.bundle import get_app_id
 from deployment.metadata import upload_metadata, upload_version_metadata
 from deployment.config import BUNDLE_ID, APP_NAME
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
     print("=" * 60)
     print("🚀 Slideshow Cast Metadata Upload")
     print("=" * 60)
@@ -28,10 +37,11 @@ def main():
     print(f"Bundle ID: {BUNDLE_ID}")
     print()
 
+    api = None
     try:
         # Initialize API client
-        api = AppStoreAPI()
-        print("✅ Connected to App Store Connect API")
+        api = AppStoreAPI(cache=ResponseCache() if "--cache" in argv else None,
+                          cassette=cassette_from_args(argv))
 
         # Get App ID
         app_id = get_app_id(api)
@@ -39,6 +49,7 @@ def main():
             print("\n❌ App not found in App Store Connect")
             print("Make sure you've created the app manually first.")
             return 1
+        print("✅ Connected to App Store Connect API")
 
         # Upload App Info metadata (name, subtitle, privacy URL)
         print("\n" + "=" * 60)
@@ -51,11 +62,12 @@ def main():
         print("\n" + "=" * 60)
         print("🔍 Finding Latest Version")
         print("=" * 60)
-        versions_result = api.get(f"apps/{app_id}/appStoreVersions?filter[appStoreState]=PREPARE_FOR_SUBMISSION")
+        version = next(api.iter(f"apps/{app_id}/appStoreVersions?filter[appStoreState]=PREPARE_FOR_SUBMISSION",
+                                fields={"appStoreVersions": "versionString"}, limit=1), None)
 
-        if versions_result.get("data") and len(versions_result["data"]) > 0:
-            version_id = versions_result["data"][0]["id"]
-            version_string = versions_result["data"][0]["attributes"]["versionString"]
+        if version:
+            version_id = version["id"]
+            version_string = version["attributes"]["versionString"]
             print(f"✅ Found version {version_string}")
 
             # Upload version-specific metadata (description, keywords, etc.)
@@ -96,6 +108,10 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        if api is not None:
+            api.close()
+            api.metrics.export("upload_metadata")
 
 
 if __name__ == "__main__":
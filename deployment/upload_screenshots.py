@@ -5,7 +5,13 @@ Upload Screenshots for Slideshow Cast
 This script uploads screenshots to App Store Connect via API.
 
 Usage:
-    python3 upload_screenshots.py
+    python3 upload_screenshots.py [--cache] [--record FILE | --replay FILE [--latency SECONDS]]
+
+Options:
+    --cache    Reuse cached API lookups from previous runs (build/cache/api.sqlite)
+    --record   Record every request/response to a cassette file (credentials scrubbed)
+    --replay   Run offline against a recorded cassette
+    --latency  Simulated seconds per replayed request, or "recorded"
 """
 
 import sys
@@ -15,12 +21,15 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from deployment.api import AppStoreAPI
+from deployment.cache import ResponseCache
+from deployment.cassette import cassette_from_args
 from deployment.bundle import get_app_id
 from deployment.screenshots import upload_screenshots
 from deployment.config import BUNDLE_ID, APP_NAME
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
     print("=" * 60)
     print("🚀 Slideshow Cast Screenshot Upload")
     print("=" * 60)
@@ -28,30 +37,33 @@ def main():
     print(f"Bundle ID: {BUNDLE_ID}")
     print()
 
+    api = None
     try:
         # Initialize API client
-        api = AppStoreAPI()
-        print("✅ Connected to App Store Connect API")
+        api = AppStoreAPI(cache=ResponseCache() if "--cache" in argv else None,
+                          cassette=cassette_from_args(argv))
 
         # Get App ID
         app_id = get_app_id(api)
         if not app_id:
             print("\n❌ App not found in App Store Connect")
             return 1
+        print("✅ Connected to App Store Connect API")
 
         # Get the version ID (look for latest version in PREPARE_FOR_SUBMISSION)
         print("\n" + "=" * 60)
         print("🔍 Finding Latest Version")
         print("=" * 60)
-        versions_result = api.get(f"apps/{app_id}/appStoreVersions?filter[appStoreState]=PREPARE_FOR_SUBMISSION&filter[platform]=IOS")
+        version = next(api.iter(f"apps/{app_id}/appStoreVersions?filter[appStoreState]=PREPARE_FOR_SUBMISSION&filter[platform]=IOS",
+                                fields={"appStoreVersions": "versionString"}, limit=1), None)
 
-        if not versions_result.get("data") or len(versions_result["data"]) == 0:
+        if not version:
             print("\n❌ No iOS version found in PREPARE_FOR_SUBMISSION state")
             print("Create a version in App Store Connect first.")
             return 1
 
-        version_id = versions_result["data"][0]["id"]
-        version_string = versions_result["data"][0]["attributes"]["versionString"]
+        version_id = version["id"]
+        version_string = version["attributes"]["versionString"]
         print(f"✅ Found version {version_string}")
 
         # Upload screenshots
@@ -59,7 +71,15 @@ def main():
         print("📸 Uploading Screenshots")
         print("=" * 60)
 
-        if upload_screenshots(api, version_id):
+        uploaded = upload_screenshots(api, version_id)
+
+        # Show connection reuse across the pooled sessions
+        print()
+        for host, host_stats in api.stats.items():
+            print(f"🔌 {host}: {host_stats['requests']} requests over "
+                  f"{host_stats['connections']} connections ({host_stats['reused']} reused)")
+
+        if uploaded:
             print("\n" + "=" * 60)
             print("✅ SUCCESS!")
             print("=" * 60)
@@ -88,6 +108,10 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        if api is not None:
+            api.close()
+            api.metrics.export("upload_screenshots")
 
 
 if __name__ == "__main__":
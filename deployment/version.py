@@ -4,9 +4,9 @@ from .api import AppStoreAPI
 from .metadata import upload_version_metadata
 
 
-def create_version(api: AppStoreAPI, app_id: str, version: str) -> str:
+def create_version(api: AppStoreAPI, app_id: str, version: str, upload_metadata: bool = True) -> str:
     """
-    Create new app version
+    Create new app version (and upload its metadata unless upload_metadata is False)
     Returns version_id or None
     """
     print(f"\n📦 Creating version {version}...")
@@ -36,16 +36,19 @@ def create_version(api: AppStoreAPI, app_id: str, version: str) -> str:
         print(f"✅ Version created: {version_id}")
 
         # Upload version-specific metadata
-        upload_version_metadata(api, version_id)
+        if upload_metadata:
+            upload_version_metadata(api, version_id)
 
         return version_id
     else:
         # Check if version already exists
         if "ENTITY_ALREADY_EXISTS" in result.get("error", ""):
             print(f"ℹ️  Version {version} already exists, fetching it...")
-            existing = api.get(f"apps/{app_id}/appStoreVersions?filter[versionString]={version}&filter[appStoreState]=PREPARE_FOR_SUBMISSION")
-            if existing.get("data"):
-                version_id = existing["data"][0]["id"]
+            existing = next(api.iter(
+                f"apps/{app_id}/appStoreVersions?filter[versionString]={version}&filter[appStoreState]=PREPARE_FOR_SUBMISSION",
+                fields={"appStoreVersions": "versionString"}, limit=1), None)
+            if existing:
+                version_id = existing["id"]
                 print(f"✅ Using existing version: {version_id}")
                 return version_id
 
@@ -57,11 +60,12 @@ def get_latest_build(api: AppStoreAPI, app_id: str) -> str:
     """Get the latest uploaded build"""
     print(f"\n🔍 Finding latest build...")
 
-    result = api.get(f"builds?filter[app]={app_id}&sort=-uploadedDate&limit=1")
+    build = next(api.iter(f"builds?filter[app]={app_id}&sort=-uploadedDate",
+                          fields={"builds": "version"}, limit=1), None)
 
-    if result.get("data") and len(result["data"]) > 0:
-        build_id = result["data"][0]["id"]
-        version = result["data"][0]["attributes"]["version"]
+    if build:
+        build_id = build["id"]
+        version = build["attributes"]["version"]
         print(f"✅ Found build: {version} ({build_id})")
         return build_id
 
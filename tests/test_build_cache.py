@@ -0,0 +1,82 @@
+"""Build cache keys and archive/IPA reuse with stubbed build commands"""
+
+from pathlib import Path
+
+import pytest
+
+from deployment import build, build_cache
+from deployment.config import ARCHIVE_PATH, EXPORT_PATH, IPA_NAME
+from deployment.hashes import HashCache
+from deployment.runner import CommandResult
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A small source tree in a scratch working directory with its own caches"""
+    monkeypatch.chdir(tmp_path)
+    hash_cache = HashCache(str(tmp_path / "hashes.sqlite"))
+    monkeypatch.setattr(build_cache, "get_hash_cache", lambda: hash_cache)
+    monkeypatch.setattr(build_cache, "BUILD_CACHE_DIR", str(tmp_path / "builds"))
+
+    (tmp_path / "App").mkdir()
+    (tmp_path / "App" / "main.swift").write_text("print(1)\n")
+    (tmp_path / "App" / "xcuserdata").mkdir()
+    (tmp_path / "App.xcodeproj").mkdir()
+    (tmp_path / "App.xcodeproj" / "project.pbxproj").write_text("objects = {};\n")
+    (tmp_path / "ExportOptions.plist").write_text("<plist/>\n")
+    yield ("App", "App.xcodeproj", "ExportOptions.plist")
+    hash_cache.close()
+
+
+def test_key_is_stable_for_an_unchanged_tree(project):
+    assert build_cache.build_key("1.0", "1", project) == build_cache.build_key("1.0", "1", project)
+
+
+def test_key_changes_with_sources_and_version(project):
+    key = build_cache.build_key("1.0", "1", project)
+
+    assert build_cache.build_key("1.1", "1", project) != key
+    assert build_cache.build_key("1.0", "2", project) != key
+
+    Path("App/main.swift").write_text("print(2) // changed\n")
+    assert build_cache.build_key("1.0", "1", project) != key
+
+
+def test_editor_state_does_not_change_the_key(project):
+    key = build_cache.build_key("1.0", "1", project)
+    Path("App/xcuserdata/breakpoints.xcbkptlist").write_text("<Bucket/>\n")
+    Path("App/.DS_Store").write_bytes(b"\0")
+
+    assert build_cache.build_key("1.0", "1", project) == key
+
+
+def test_cached_archive_and_ipa_round_trip(project, monkeypatch):
+    commands = []
+
+    def fake_run_command(command, **kwargs):
+        commands.append(command)
+        if "-exportArchive" in command:
+            Path(EXPORT_PATH, IPA_NAME).write_bytes(b"ipa")
+        else:
+            Path(ARCHIVE_PATH, "Products").mkdir(parents=True)
+            Path(ARCHIVE_PATH, "Products", "App").write_bytes(b"binary")
+        return CommandResult(command, 0, 0.0, {}, [], [])
+
+    monkeypatch.setattr(build, "run_command", fake_run_command)
+    key = build_cache.build_key("1.0", "1", project)
+
+    assert build.build_archive(key) and build.export_ipa(key)
+    assert len(commands) == 2
+
+    Path(ARCHIVE_PATH, "Products", "App").unlink()
+    Path(EXPORT_PATH, IPA_NAME).unlink()
+
+    assert build.build_archive(key) and build.export_ipa(key)
+    assert len(commands) == 2
+    assert Path(ARCHIVE_PATH, "Products", "App").read_bytes() == b"binary"
+    assert Path(EXPORT_PATH, IPA_NAME).read_bytes() == b"ipa"
+
+
+def test_a_miss_restores_nothing(project):
+    assert not build_cache.restore_artifact("0" * 64, ARCHIVE_PATH)
+    assert not Path(ARCHIVE_PATH).exists()
@@ -0,0 +1,60 @@
+"""Streaming subprocess runner driven by local shell commands"""
+
+from deployment.runner import run_command
+
+
+def sh(script, **kwargs):
+    events = []
+    result = run_command(["sh", "-c", script], on_event=events.append, **kwargs)
+    return result, events
+
+
+def test_phases_are_announced_once_and_timed():
+    result, events = sh(
+        "echo 'CompileSwift normal arm64 A.swift'; echo 'Ld /build/App normal'; "
+        "echo 'CompileSwift normal arm64 B.swift'; echo 'CodeSign /build/App.app'; "
+        "echo '** ARCHIVE SUCCEEDED **'"
+    )
+
+    assert result.ok
+    assert [event["phase"] for event in events if event["type"] == "phase"] == \
+        ["compile", "link", "codesign", "archive"]
+    assert result.phases["compile"]["lines"] == 2
+    assert result.phases["compile"]["end"] >= result.phases["compile"]["start"]
+
+
+def test_upload_progress_is_reported_in_steps():
+    result, events = sh(
+        "for p in 0 5 10 15 20 50 100; do echo \"Upload progress: $p%\"; done; echo 'UPLOAD SUCCEEDED'"
+    )
+
+    assert [event["percent"] for event in events if event["type"] == "progress"] == [0, 10, 20, 50, 100]
+    assert result.phases["upload"]["lines"] == 8
+
+
+def test_lines_mentioning_upload_are_not_upload_progress():
+    result, events = sh("echo 'Preparing upload of MemorySlideshow.ipa'; echo 'error: upload failed: 50%'")
+
+    assert "upload" not in result.phases
+    assert not events
+
+
+def test_tail_is_capped_and_errors_are_kept():
+    result, _ = sh(
+        "echo 'A.swift:1:1: error: cannot find x in scope' >&2; echo 'warning: deprecated' >&2; "
+        "i=0; while [ $i -lt 500 ]; do echo line $i; i=$((i+1)); done; exit 3",
+        tail_lines=50
+    )
+
+    assert not result.ok
+    assert result.returncode == 3
+    assert len(result.tail) == 50
+    assert "line 499" in result.tail
+    assert result.errors == ["A.swift:1:1: error: cannot find x in scope"]
+
+
+def test_missing_command_fails_cleanly():
+    result = run_command(["slidecast-no-such-command"], on_event=None)
+
+    assert result.returncode == 127
+    assert not result.ok